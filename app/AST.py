@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import Any
+from app.scanner import TokenType
 
 # expression     → literal
 #                | unary
@@ -14,64 +16,111 @@ from typing import Any
 #                | "+"  | "-"  | "*" | "/" ;
 
 # Note: Literal is an expression but op not expression
+# op is the TokenType of the operator token, OPERATORS gives its lexme back
+
+OPERATORS: dict[TokenType, str] = {
+    TokenType.EQUAL_EQUAL: '==',
+    TokenType.BANG_EQUAL: '!=',
+    TokenType.LESS: '<',
+    TokenType.LESS_EQUAL: '<=',
+    TokenType.GREATER: '>',
+    TokenType.GREATER_EQUAL: '>=',
+    TokenType.PLUS: '+',
+    TokenType.MINUS: '-',
+    TokenType.STAR: '*',
+    TokenType.SLASH: '/',
+    TokenType.BANG: '!',
+}
+
+
+class Type(IntEnum):
+    # the type of a value as far as TypeInference can tell
+    UNKNOWN = 0
+    NUMBER = 1
+    STRING = 2
+    BOOL = 3
+    NIL = 4
+
+
+# line is the source line a node comes from (0 when unknown), it is left out
+# of comparisons so equal trees stay equal wherever they were written.
+# operands is the type TypeInference proved the operands of a Unary or Binary
+# to have, NUMBER or STRING let the engines skip their type checks
 
 
 class Expr:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: Any
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+# slot is the index of the variable in Env.values, -1 until the Resolver ran
+
+
+@dataclass(slots=True)
 class Variable(Expr):
     name: str
+    slot: int = -1
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     name: str
     expr: Expr
+    slot: int = -1
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expr: Expr
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
-    op: str
+    op: TokenType
     expr: Expr
+    line: int = field(default=0, compare=False)
+    operands: Type = field(default=Type.UNKNOWN, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     lexpr: Expr
     rexpr: Expr
-    op: str
+    op: TokenType
+    line: int = field(default=0, compare=False)
+    operands: Type = field(default=Type.UNKNOWN, compare=False)
 
 
 class Stmt():
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class PrintStmt(Stmt):
     expr: Expr
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     expr: Expr
+    line: int = field(default=0, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Decl(Stmt):
     name: str
     expr: Expr | None
+    slot: int = -1
+    line: int = field(default=0, compare=False)
 
 
 def print_ast(expr: Expr) -> str | None:
@@ -87,6 +136,23 @@ def print_ast(expr: Expr) -> str | None:
     if isinstance(expr, Grouping):
         return f"(group {print_ast(expr.expr)})"
     if isinstance(expr, Unary):
-        return f"({expr.op} {print_ast(expr.expr)})"
+        return f"({OPERATORS[expr.op]} {print_ast(expr.expr)})"
     if isinstance(expr, Binary):
-        return f"({expr.op} {print_ast(expr.lexpr)} {print_ast(expr.rexpr)})"
+        return f"({OPERATORS[expr.op]} {print_ast(expr.lexpr)} {print_ast(expr.rexpr)})"
+
+
+def postorder(expr: Expr) -> list[Expr]:
+    # every node after its operands, left before right, the order evaluate
+    # visits them in; built with a work list so any depth fits
+    order: list[Expr] = []
+    work: list[Expr] = [expr]
+    while work:
+        node = work.pop()
+        order.append(node)
+        if isinstance(node, Binary):
+            work.append(node.lexpr)
+            work.append(node.rexpr)
+        elif isinstance(node, (Grouping, Unary, Assign)):
+            work.append(node.expr)
+    order.reverse()
+    return order
@@ -1,6 +1,7 @@
+from typing import Any, Callable, Iterable, Iterator
 from app.AST import *
 from app.AST import Expr
-from app.scanner import Token
+from app.scanner import Token, TokenType
 
 # program        → declaration* EOF ;
 
@@ -28,52 +29,95 @@ from app.scanner import Token
 #                | "(" expression ")" | IDENTIFIER ;
 
 
+# binary operator precedence levels, higher binds tighter
+EQUALITY = 1
+COMPARISON = 2
+TERM = 3
+FACTOR = 4
+
+PRECEDENCE: dict[TokenType, int] = {
+    TokenType.BANG_EQUAL: EQUALITY,
+    TokenType.EQUAL_EQUAL: EQUALITY,
+    TokenType.GREATER: COMPARISON,
+    TokenType.GREATER_EQUAL: COMPARISON,
+    TokenType.LESS: COMPARISON,
+    TokenType.LESS_EQUAL: COMPARISON,
+    TokenType.MINUS: TERM,
+    TokenType.PLUS: TERM,
+    TokenType.SLASH: FACTOR,
+    TokenType.STAR: FACTOR,
+}
+
+UNARY: frozenset[TokenType] = frozenset({TokenType.BANG, TokenType.MINUS})
+
+# pending operator frames on the expression stack are (binding power, left
+# operand, op, line); unary binds tighter than every binary level, "=" looser
+# and an open "(" loosest, so neither is folded into by the operators that follow it
+UNARY_POWER = FACTOR + 1
+ASSIGN_POWER = 0
+GROUP_POWER = -1
+BOTTOM = (-2, None, None, 0)
+
+KEYWORDS: dict[TokenType, Any] = {
+    TokenType.TRUE: True,
+    TokenType.FALSE: False,
+    TokenType.NIL: None,
+}
+
+
 class Parser:
-    def __init__(self, tokens: list[Token]) -> None:
-        self.tokens: list[Token] = tokens
-        self.current = 0
+    def __init__(self, tokens: Iterable[Token]) -> None:
+        # tokens may be a list or a lazy stream (Scanner.scan_stream),
+        # only the current token is kept as lookahead
+        self.tokens: Iterator[Token] = iter(tokens)
+        self.current: Token = next(self.tokens)
 
     def peek(self) -> Token:
-        return self.tokens[self.current]
+        return self.current
 
     def advance(self) -> Token:
-        tok = self.peek()
-        self.current += 1
+        tok = self.current
+        if tok.type != TokenType.EOF:
+            self.current = next(self.tokens)
         return tok
 
-    def match(self, *types: str) -> Token | None:
+    def match(self, *types: TokenType) -> Token | None:
         kind = self.peek().type
         if kind in types:
             return self.advance()
         return None
 
-    def check(self, type: str) -> bool:
+    def check(self, type: TokenType) -> bool:
         kind = self.peek().type
         if kind == type:
             return True
         return False
 
-    def consume(self, type: str, expected: str) -> None:
+    def consume(self, type: TokenType, expected: str) -> None:
         if self.check(type):
             self.advance()
         else:
             raise SyntaxError(expected)
 
     def at_end(self) -> bool:
-        return self.peek().type == 'EOF'
+        return self.peek().type == TokenType.EOF
 
     def decl(self) -> Stmt:
-        if self.match('VAR'):
-            return self.vardecl()
+        # a statement's line is the line it starts on
+        line = self.current.line
+        if self.match(TokenType.VAR):
+            stmt = self.vardecl()
         else:
-            return self.statment()
+            stmt = self.statment()
+        stmt.line = line
+        return stmt
 
     def vardecl(self) -> Stmt:
-        if token := self.match('IDENTIFIER'):
+        if token := self.match(TokenType.IDENTIFIER):
             expr = None
-            if self.match('EQUAL'):
+            if self.match(TokenType.EQUAL):
                 expr = self.expression()
-            self.consume('SEMICOLON', 'Missing ;')
+            self.consume(TokenType.SEMICOLON, 'Missing ;')
             return Decl(token.lexme, expr)
         else:
             token = self.peek()
@@ -81,93 +125,177 @@ class Parser:
                 f'[line {token.line}]: Expected Identifier after var')
 
     def statment(self) -> Stmt:
-        if self.match('PRINT'):
+        if self.match(TokenType.PRINT):
             return self.printstatment()
         else:
             return self.exprstatment()
 
     def exprstatment(self) -> Stmt:
         expr = self.expression()
-        self.consume('SEMICOLON', 'Statment missing ;')
+        self.consume(TokenType.SEMICOLON, 'Statment missing ;')
         return ExprStmt(expr)
 
     def printstatment(self) -> Stmt:
         expr = self.expression()
-        self.consume('SEMICOLON', 'Statment missing ;')
+        self.consume(TokenType.SEMICOLON, 'Statment missing ;')
         return PrintStmt(expr)
 
+    def expression(self) -> Expr:
+        # precedence climbing over an explicit stack of pending operator frames,
+        # so deep nesting and long operator chains never grow the python stack
+        stack: list[tuple] = [BOTTOM]
+        push = stack.append
+        pop = stack.pop
+        rules = self.PRIMARY
+        tokens = self.tokens
+        # never advanced past EOF, only operators, "(", ")" and primaries are consumed
+        token = self.current
+        while True:
+            # prefix: unary operators and "(" up to the operand's primary
+            kind = token.type
+            rule = rules.get(kind)
+            if rule is None:
+                if kind in UNARY:
+                    push((UNARY_POWER, None, kind, token.line))
+                elif kind == TokenType.LEFT_PAREN:
+                    push((GROUP_POWER, None, None, token.line))
+                else:
+                    self.current = token
+                    return self.primary()  # raises Expect expression
+                token = next(tokens)
+                continue
+            expr = rule(self, token)
+            token = next(tokens)
+            # infix: fold the operand into the pending frames that bind at least
+            # as tight as what follows it, so binary operators are left associative
+            while True:
+                kind = token.type
+                power = PRECEDENCE.get(kind)
+                if power is not None:
+                    while stack[-1][0] >= power:
+                        _, left, op, line = pop()
+                        expr = Unary(op, expr, line) if left is None else Binary(left, expr, op, line)
+                    push((power, expr, kind, token.line))
+                    token = next(tokens)
+                    break
+                while stack[-1][0] > ASSIGN_POWER:
+                    _, left, op, line = pop()
+                    expr = Unary(op, expr, line) if left is None else Binary(left, expr, op, line)
+                if kind == TokenType.EQUAL:
+                    push((ASSIGN_POWER, expr, None, token.line))
+                    token = next(tokens)
+                    break
+                # assignment is right associative, the innermost closes first
+                while stack[-1][0] == ASSIGN_POWER:
+                    _, target, _, line = pop()
+                    if not isinstance(target, Variable):
+                        raise SyntaxError("Invalid assignment target.")
+                    expr = Assign(target.name, expr, line=line)
+                self.current = token
+                if stack[-1] is BOTTOM:
+                    return expr
+                self.consume(TokenType.RIGHT_PAREN, 'Expected )')
+                expr = Grouping(expr, pop()[3])
+                token = self.current
+
+    def primary(self) -> Expr:
+        token = self.current
+        if rule := self.PRIMARY.get(token.type):
+            self.advance()
+            return rule(self, token)
+        raise SyntaxError(
+            f"[line {token.line}] Error at '{token.lexme}': Expect expression.")
+
+    def literal(self, token: Token) -> Expr:
+        return Literal(token.literal, token.line)
+
+    def keyword(self, token: Token) -> Expr:
+        return Literal(KEYWORDS[token.type], token.line)
+
+    def variable(self, token: Token) -> Expr:
+        return Variable(token.lexme, line=token.line)
+
+    # token kind -> how primary parses the expression it starts
+    PRIMARY: dict[TokenType, Callable[['Parser', Token], Expr]] = {
+        TokenType.TRUE: keyword,
+        TokenType.FALSE: keyword,
+        TokenType.NIL: keyword,
+        TokenType.NUMBER: literal,
+        TokenType.STRING: literal,
+        TokenType.IDENTIFIER: variable,
+    }
+
+    def parse(self) -> list[Stmt]:
+        return list(self.declarations())
+
+    def declarations(self) -> Iterator[Stmt]:
+        # yields each top level declaration as soon as it is parsed
+        while not self.at_end():
+            yield self.decl()
+
+    def parse_expr(self) -> Expr:
+        return self.expression()
+
+
+class LadderParser(Parser):
+    # the recursive descent ladder, one method per precedence level; kept as
+    # the reference Parser.expression is checked and benchmarked against
+
     def expression(self) -> Expr:
         return self.assignment()
 
     def assignment(self) -> Expr:
         expr: Expr = self.equality()
-        if self.match('EQUAL'):
+        if token := self.match(TokenType.EQUAL):
             value: Expr = self.assignment()
             if isinstance(expr, Variable):
-                return Assign(expr.name, value)
+                return Assign(expr.name, value, line=token.line)
             else:
                 raise SyntaxError("Invalid assignment target.")
         return expr
 
     def equality(self) -> Expr:
         expr: Expr = self.comparison()
-        while (token := self.match("BANG_EQUAL", "EQUAL_EQUAL")):
+        while PRECEDENCE.get(self.current.type) == EQUALITY:
+            token = self.advance()
             right: Expr = self.comparison()
-            expr = Binary(expr, right, token.lexme)
+            expr = Binary(expr, right, token.type, token.line)
         return expr
 
     def comparison(self) -> Expr:
         expr: Expr = self.term()
-        while (token := self.match("LESS_EQUAL", "GREATER_EQUAL", "LESS", "GREATER")):
+        while PRECEDENCE.get(self.current.type) == COMPARISON:
+            token = self.advance()
             right: Expr = self.term()
-            expr = Binary(expr, right, token.lexme)
+            expr = Binary(expr, right, token.type, token.line)
         return expr
 
     def term(self) -> Expr:
         expr: Expr = self.factor()
-        while (token := self.match("PLUS", "MINUS")):
+        while PRECEDENCE.get(self.current.type) == TERM:
+            token = self.advance()
             right: Expr = self.factor()
-            expr = Binary(expr, right, token.lexme)
+            expr = Binary(expr, right, token.type, token.line)
         return expr
 
     def factor(self) -> Expr:
         expr: Expr = self.unary()
-        while (token := self.match("SLASH", "STAR")):
+        while PRECEDENCE.get(self.current.type) == FACTOR:
+            token = self.advance()
             right: Expr = self.unary()
-            expr = Binary(expr, right, token.lexme)
+            expr = Binary(expr, right, token.type, token.line)
         return expr
 
     def unary(self) -> Expr:
-        if token := self.match("BANG", "MINUS"):
+        if self.current.type in UNARY:
+            token = self.advance()
             right: Expr = self.unary()
-            return Unary(token.lexme, right)
+            return Unary(token.type, right, token.line)
         return self.primary()
 
-    def primary(self) -> Expr:
-        if token := self.match('TRUE'):
-            return Literal(True)
-        elif token := self.match('FALSE'):
-            return Literal(False)
-        elif token := self.match('NIL'):
-            return Literal(None)
-        elif token := self.match('NUMBER', 'STRING'):
-            return Literal(token.literal)
-        elif self.match('LEFT_PAREN'):
-            expr: Expr = self.expression()
-            self.consume('RIGHT_PAREN', 'Expected )')
-            return Grouping(expr)
-        elif token := self.match('IDENTIFIER'):
-            return Variable(token.lexme)
-
-        token = self.peek()
-        raise SyntaxError(
-            f"[line {token.line}] Error at '{token.lexme}': Expect expression.")
+    def grouping(self, token: Token) -> Expr:
+        expr: Expr = self.expression()
+        self.consume(TokenType.RIGHT_PAREN, 'Expected )')
+        return Grouping(expr, token.line)
 
-    def parse(self) -> list[Stmt]:
-        statments: list[Stmt] = []
-        while not self.at_end():
-            statments.append(self.decl())
-        return statments
-
-    def parse_expr(self) -> Expr:
-        return self.expression()
+    PRIMARY = {**Parser.PRIMARY, TokenType.LEFT_PAREN: grouping}
@@ -0,0 +1,2 @@
+# bump when the AST or its semantics change, cached ASTs of other versions are ignored
+__version__ = '0.6.0'
@@ -0,0 +1,67 @@
+import io
+import json
+import multiprocessing
+import os
+from functools import partial
+from typing import Any, Callable
+
+from app.output import Output
+
+# main.execute, passed in so the workers run scripts exactly like the run command
+Command = Callable[[str, str, dict[str, str], Output, str | None], None]
+
+
+def scripts(target: str) -> list[str]:
+    # a directory is searched for .lox files, anything else is a manifest
+    # listing one script per line, relative to the manifest
+    if os.path.isdir(target):
+        found: list[str] = []
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            found.extend(os.path.join(root, name)
+                         for name in sorted(files) if name.endswith('.lox'))
+        return found
+    base = os.path.dirname(target)
+    with open(target, encoding='utf-8') as file:
+        return [os.path.join(base, line.strip()) for line in file if line.strip()]
+
+
+def capture(execute: Command, command: str, filename: str, options: dict[str, str],
+            source: str | None = None) -> dict[str, Any]:
+    # runs one command with its stdout and stderr captured
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    out = Output(stdout, stderr)
+    code = 0
+    try:
+        execute(command, filename, options, out, source)
+    except SystemExit as e:
+        code = e.code or 0
+    except Exception as e:
+        # e.g. a missing file, what the process would have died with
+        out.error(e)
+        code = 1
+    out.flush()
+    return {'code': code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+def run_script(execute: Command, options: dict[str, str], path: str) -> str:
+    # the result of running one script as a JSON line
+    return json.dumps({'file': path, **capture(execute, 'run', path, options)})
+
+
+def batch(target: str, options: dict[str, str], out: Output, execute: Command,
+          jobs: int = 0) -> None:
+    # workers import the interpreter once and run many scripts each, results
+    # are written in the order of the scripts
+    paths = scripts(target)
+    jobs = jobs or os.cpu_count() or 1
+    run = partial(run_script, execute, options)
+    if jobs == 1:
+        for line in map(run, paths):
+            out.line(line)
+        return
+    with multiprocessing.Pool(jobs) as pool:
+        chunksize = max(1, len(paths) // (jobs * 8))
+        for line in pool.imap(run, paths, chunksize):
+            out.line(line)
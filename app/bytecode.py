@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+from app.AST import *
+
+# every instruction is two slots wide: an opcode and an operand
+# (an index into the constant pool or a variable slot, 0 when unused)
+
+# binary ops taking both operands from the stack,
+# SUB..LESS_EQUAL must stay contiguous, the vm checks them with one range test
+ADD = 0
+SUB = 1
+MUL = 2
+DIV = 3
+GREATER = 4
+GREATER_EQUAL = 5
+LESS = 6
+LESS_EQUAL = 7
+EQUAL = 8
+NOT_EQUAL = 9
+# added to a binary op when its right operand is the constant / the variable
+# slot given by the operand instead of the top of the stack
+RIGHT_CONST = 10
+RIGHT_VAR = 20
+BINARY_END = 30
+
+CONST = 30
+GET = 31
+SET = 32
+DEFINE = 33
+NEGATE = 34
+NOT = 35
+POP = 36
+PRINT = 37
+RETURN = 38
+# charges its operand against the run's Limits, VM compiles one before every
+# statement when there are limits
+STEP = 39
+
+BINARY_OPS: dict[TokenType, int] = {
+    TokenType.PLUS: ADD,
+    TokenType.MINUS: SUB,
+    TokenType.STAR: MUL,
+    TokenType.SLASH: DIV,
+    TokenType.GREATER: GREATER,
+    TokenType.GREATER_EQUAL: GREATER_EQUAL,
+    TokenType.LESS: LESS,
+    TokenType.LESS_EQUAL: LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: EQUAL,
+    TokenType.BANG_EQUAL: NOT_EQUAL,
+}
+
+UNARY_OPS: dict[TokenType, int] = {
+    TokenType.MINUS: NEGATE,
+    TokenType.BANG: NOT,
+}
+
+
+@dataclass
+class Chunk:
+    code: list[int] = field(default_factory=list)
+    constants: list[Any] = field(default_factory=list)
+
+
+class Compiler:
+    def __init__(self) -> None:
+        self.chunk = Chunk()
+        # keyed by type too so that 1.0 and true get different slots
+        self.constant_slots: dict[tuple[type, Any], int] = dict()
+
+    def compile(self, stmts: Iterable[Stmt]) -> Chunk:
+        for stmt in stmts:
+            self.stmt(stmt)
+        self.emit(RETURN)
+        return self.chunk
+
+    def constant(self, value: Any) -> int:
+        key = (type(value), value)
+        slot = self.constant_slots.get(key)
+        if slot is None:
+            slot = self.constant_slots[key] = len(self.chunk.constants)
+            self.chunk.constants.append(value)
+        return slot
+
+    def emit(self, op: int, operand: int = 0) -> None:
+        self.chunk.code += (op, operand)
+
+    def stmt(self, stmt: Stmt) -> None:
+        if isinstance(stmt, PrintStmt):
+            self.expr(stmt.expr)
+            self.emit(PRINT)
+        elif isinstance(stmt, ExprStmt):
+            self.expr(stmt.expr)
+            self.emit(POP)
+        elif isinstance(stmt, Decl):
+            if stmt.expr:
+                self.expr(stmt.expr)
+            else:
+                self.emit(CONST, self.constant(None))
+            self.emit(DEFINE, stmt.slot)
+
+    def expr(self, expr: Expr) -> None:
+        if isinstance(expr, Binary):
+            self.expr(expr.lexpr)
+            op = BINARY_OPS[expr.op]
+            right = expr.rexpr
+            while isinstance(right, Grouping):
+                right = right.expr
+            # fold a leaf right operand into the binary instruction
+            if isinstance(right, Literal):
+                self.emit(op + RIGHT_CONST, self.constant(right.value))
+            elif isinstance(right, Variable):
+                self.emit(op + RIGHT_VAR, right.slot)
+            else:
+                self.expr(right)
+                self.emit(op)
+        elif isinstance(expr, Literal):
+            self.emit(CONST, self.constant(expr.value))
+        elif isinstance(expr, Variable):
+            self.emit(GET, expr.slot)
+        elif isinstance(expr, Grouping):
+            self.expr(expr.expr)
+        elif isinstance(expr, Unary):
+            self.expr(expr.expr)
+            self.emit(UNARY_OPS[expr.op])
+        elif isinstance(expr, Assign):
+            self.expr(expr.expr)
+            self.emit(SET, expr.slot)
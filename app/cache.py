@@ -0,0 +1,156 @@
+import dataclasses
+import hashlib
+import marshal
+import os
+import zlib
+from mmap import mmap
+from enum import IntEnum
+from typing import Any
+from app import __version__
+from app.AST import *
+
+# node classes by their code in the serialized form, append only
+NODE_TYPES: list[type] = [Literal, Variable, Assign, Grouping, Unary, Binary,
+                          PrintStmt, ExprStmt, Decl]
+NODE_CODES: dict[type, int] = {t: i for i, t in enumerate(NODE_TYPES)}
+# positions and classes of the enum fields (operators, inferred types) of
+# each node class, they are stored as plain ints
+ENUM_FIELDS: list[list[tuple[int, type[IntEnum]]]] = [
+    [(i, f.type) for i, f in enumerate(dataclasses.fields(t)) if f.type in (TokenType, Type)]
+    for t in NODE_TYPES]
+
+DEFAULT_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                           os.path.expanduser('~/.cache'), 'lox')
+DEFAULT_SIZE = 64 << 20
+# the suffix of compiled programs, ASTs end in .ast
+PROGRAM = '.prog'
+
+
+def encode(node: Any) -> Any:
+    # nodes become (code, *fields) tuples, field values are never tuples
+    if isinstance(node, (Expr, Stmt)):
+        return (NODE_CODES[type(node)],
+                *(encode(getattr(node, f.name)) for f in dataclasses.fields(node)))
+    if isinstance(node, IntEnum):
+        return int(node)
+    return node
+
+
+def decode(data: Any) -> Any:
+    if isinstance(data, tuple):
+        fields = [decode(value) for value in data[1:]]
+        for i, enum in ENUM_FIELDS[data[0]]:
+            fields[i] = enum(fields[i])
+        return NODE_TYPES[data[0]](*fields)
+    return data
+
+
+def dump_ast(stmts: list[Stmt], removed: int = 0) -> bytes:
+    # removed is the number of nodes the optimizer took out, kept for its report
+    data = marshal.dumps((removed, tuple(encode(stmt) for stmt in stmts)))
+    return zlib.compress(data, 1)
+
+
+def load_ast(data: bytes) -> tuple[list[Stmt], int]:
+    removed, stmts = marshal.loads(zlib.decompress(data))
+    return [decode(stmt) for stmt in stmts], removed
+
+
+def dump_program(program: Any, removed: int = 0, inferred: tuple[int, int] = (0, 0)) -> bytes:
+    # a transpiler.Program, its code object marshals as is. inferred is the
+    # specialized and total operations counted by TypeInference
+    return zlib.compress(marshal.dumps((removed, inferred, program)), 1)
+
+
+def load_program(data: bytes) -> tuple[Any, int, tuple[int, int]]:
+    removed, inferred, program = marshal.loads(zlib.decompress(data))
+    return program, removed, inferred
+
+
+class ASTCache():
+    # parsed programs stored on disk by a hash of their source, like .pyc files.
+    # entries are evicted least recently used first once the directory
+    # outgrows max_size bytes, a hit refreshes the entry's mtime
+    def __init__(self, directory: str = DEFAULT_DIR, max_size: int = DEFAULT_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, source: str | bytes | mmap, optimized: bool = False, variant: str = '') -> str:
+        # variant tells apart entries built differently from the same source,
+        # a mapped source is hashed as the bytes of the file
+        h = hashlib.sha256(f'{__version__}:{int(optimized)}:{variant}:'.encode())
+        h.update(source.encode('utf-8', 'surrogatepass') if isinstance(source, str) else source)
+        return h.hexdigest()
+
+    def path(self, key: str, suffix: str = '.ast') -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def load(self, key: str) -> tuple[list[Stmt], int] | None:
+        # returns the statements and the number of nodes the optimizer removed
+        data = self.read(self.path(key))
+        try:
+            return load_ast(data) if data else None
+        except (ValueError, EOFError, TypeError, IndexError, zlib.error):
+            return None
+
+    def store(self, key: str, stmts: list[Stmt], removed: int = 0) -> None:
+        try:
+            data = dump_ast(stmts, removed)
+        except (ValueError, RecursionError):
+            # too deeply nested to serialize, just don't cache it
+            return
+        self.write(self.path(key), data)
+
+    def load_program(self, key: str) -> tuple[Any, int, tuple[int, int]] | None:
+        # a program compiled by the python engine and the optimizer's and
+        # type inference's counts
+        data = self.read(self.path(key, PROGRAM))
+        try:
+            return load_program(data) if data else None
+        except (ValueError, EOFError, TypeError, zlib.error):
+            return None
+
+    def store_program(self, key: str, program: Any, removed: int = 0,
+                      inferred: tuple[int, int] = (0, 0)) -> None:
+        try:
+            data = dump_program(program, removed, inferred)
+        except ValueError:
+            return
+        self.write(self.path(key, PROGRAM), data)
+
+    def read(self, path: str) -> bytes | None:
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def write(self, path: str, data: bytes) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as file:
+                file.write(data)
+            os.replace(tmp, path)
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(('.ast', PROGRAM)):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,274 @@
+from typing import Any, Callable, Iterable
+import operator
+from app.AST import *
+from app.env import UNDEFINED
+from app.evaluator import Evaluator, add as add_values
+from app.interpreter import Interpreter
+from app.output import Output
+from app.limits import Limits
+from app.rope import STRINGS, concat
+
+Closure = Callable[[], Any]
+BinaryFactory = Callable[[Closure, Closure | None, Any], Closure]
+
+
+# a binary factory gets the closures of both operands, and the value of the right
+# operand when it is a literal so the common `expr op constant` case skips a call
+
+
+def add(lhs: Closure, rhs: Closure, const: Any = None) -> Closure:
+    if rhs is None:
+        def closure() -> Any:
+            left = lhs()
+            if type(left) is type(const) and type(left) is not str:
+                return left + const
+            if type(left) in STRINGS and type(const) in STRINGS:
+                return concat(left, const)
+            raise RuntimeError('Operands must be two numbers or two strings.')
+        return closure
+
+    def closure() -> Any:
+        left = lhs()
+        right = rhs()
+        if type(left) is type(right) and type(left) is not str:
+            return left + right
+        if type(left) in STRINGS and type(right) in STRINGS:
+            return concat(left, right)
+        raise RuntimeError('Operands must be two numbers or two strings.')
+    return closure
+
+
+def limited_add(limits: Limits) -> BinaryFactory:
+    # add with the string limit checked before the two strings are joined
+    def factory(lhs: Closure, rhs: Closure | None, const: Any = None) -> Closure:
+        right_value = rhs or (lambda: const)
+
+        def closure() -> Any:
+            left = lhs()
+            right = right_value()
+            limits.concat(left, right)
+            return add_values(left, right)
+        return closure
+    return factory
+
+
+def numeric(fn: Callable[[float, float], Any]) -> BinaryFactory:
+    def factory(lhs: Closure, rhs: Closure, const: Any = None) -> Closure:
+        if rhs is None:
+            if not isinstance(const, float):
+                def closure() -> Any:
+                    lhs()
+                    raise RuntimeError('Operands must be numbers.')
+                return closure
+
+            def closure() -> Any:
+                left = lhs()
+                if isinstance(left, float):
+                    return fn(left, const)
+                raise RuntimeError('Operands must be numbers.')
+            return closure
+
+        def closure() -> Any:
+            left = lhs()
+            right = rhs()
+            if isinstance(left, float) and isinstance(right, float):
+                return fn(left, right)
+            raise RuntimeError('Operands must be numbers.')
+        return closure
+    return factory
+
+
+def unchecked(fn: Callable[[Any, Any], Any]) -> BinaryFactory:
+    # equality takes any operands, the others only numbers proved beforehand
+    def factory(lhs: Closure, rhs: Closure, const: Any = None) -> Closure:
+        if rhs is None:
+            return lambda: fn(lhs(), const)
+        return lambda: fn(lhs(), rhs())
+    return factory
+
+
+def negate(operand: Closure) -> Closure:
+    def closure() -> Any:
+        value = operand()
+        if isinstance(value, float):
+            return -value
+        raise RuntimeError('Operand must be a number.')
+    return closure
+
+
+def bang(operand: Closure) -> Closure:
+    def closure() -> Any:
+        return not operand()
+    return closure
+
+
+BINARY: dict[TokenType, BinaryFactory] = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: numeric(operator.sub),
+    TokenType.STAR: numeric(operator.mul),
+    TokenType.SLASH: numeric(operator.truediv),
+    TokenType.GREATER: numeric(operator.gt),
+    TokenType.GREATER_EQUAL: numeric(operator.ge),
+    TokenType.LESS: numeric(operator.lt),
+    TokenType.LESS_EQUAL: numeric(operator.le),
+    TokenType.EQUAL_EQUAL: unchecked(operator.eq),
+    TokenType.BANG_EQUAL: unchecked(operator.ne),
+}
+
+# the operators on operands TypeInference proved to be numbers, unchecked
+NUMBER_BINARY: dict[TokenType, BinaryFactory] = {
+    TokenType.PLUS: unchecked(operator.add),
+    TokenType.MINUS: unchecked(operator.sub),
+    TokenType.STAR: unchecked(operator.mul),
+    TokenType.SLASH: unchecked(operator.truediv),
+    TokenType.GREATER: unchecked(operator.gt),
+    TokenType.GREATER_EQUAL: unchecked(operator.ge),
+    TokenType.LESS: unchecked(operator.lt),
+    TokenType.LESS_EQUAL: unchecked(operator.le),
+}
+
+UNARY: dict[TokenType, Callable[[Closure], Closure]] = {
+    TokenType.MINUS: negate,
+    TokenType.BANG: bang,
+}
+
+
+class ClosureEvaluator(Evaluator):
+    # compiles an expression once into nested python closures, the operator
+    # and node type are resolved at compile time instead of on every visit
+    binary: dict[TokenType, BinaryFactory] = BINARY
+
+    def limit(self, limits: Limits) -> None:
+        super().limit(limits)
+        if limits.max_string:
+            self.binary = {**BINARY, TokenType.PLUS: limited_add(limits)}
+
+    def evaluate(self, expression: Expr) -> Any:
+        return self.compile(expression)()
+
+    def compile(self, expression: Expr) -> Closure:
+        if isinstance(expression, Binary):
+            lhs = self.compile(expression.lexpr)
+            right = expression.rexpr
+            while isinstance(right, Grouping):
+                right = right.expr
+            if expression.operands is Type.STRING:
+                concat = self.concat
+                rhs = self.compile(right)
+                return lambda: concat(lhs(), rhs())
+            # both operands are known numbers, or the operator checks them
+            binary = NUMBER_BINARY if expression.operands else self.binary
+            if isinstance(right, Literal):
+                return binary[expression.op](lhs, None, right.value)
+            return binary[expression.op](lhs, self.compile(right))
+        elif isinstance(expression, Literal):
+            value = expression.value
+            return lambda: value
+        elif isinstance(expression, Variable):
+            return self.variable(expression)
+        elif isinstance(expression, Grouping):
+            return self.compile(expression.expr)
+        elif isinstance(expression, Unary):
+            operand = self.compile(expression.expr)
+            if expression.operands:
+                return lambda: -operand()
+            return UNARY[expression.op](operand)
+        elif isinstance(expression, Assign):
+            return self.assign(expression, self.compile(expression.expr))
+        raise TypeError(f'Cannot compile {expression}')
+
+    def variable(self, expression: Variable) -> Closure:
+        if expression.slot < 0:
+            return lambda: self.env.get(expression.name)
+        values = self.env.values
+        get_at = self.env.get_at
+        slot = expression.slot
+
+        def closure() -> Any:
+            value = values[slot]
+            if value is UNDEFINED:
+                return get_at(slot)
+            return value
+        return closure
+
+    def assign(self, expression: Assign, expr: Closure) -> Closure:
+        if expression.slot < 0:
+            name = expression.name
+            put = self.env.put
+
+            def closure() -> Any:
+                value = expr()
+                put(name, value)
+                return value
+            return closure
+
+        values = self.env.values
+        slot = expression.slot
+
+        def closure() -> Any:
+            value = expr()
+            values[slot] = value
+            return value
+        return closure
+
+
+class ClosureInterpreter(Interpreter):
+    # executes every statement through closures built by ClosureEvaluator
+
+    def __init__(self, stmts: Iterable[Stmt], out: Output | None = None,
+                 limits: Limits | None = None) -> None:
+        self.evaluator: ClosureEvaluator
+        super().__init__(stmts, ClosureEvaluator(), out, limits)
+
+    def interpret(self) -> None:
+        if not isinstance(self.stmts, list):
+            # streamed statements are compiled one by one as they are parsed
+            super().interpret()
+            return
+        # the whole program is resolved and compiled before any of it runs,
+        # each closure is paired with the steps its statement is charged
+        program: list[tuple[int, Callable[[], None]]] = []
+        for stmt in self.stmts:
+            stmt = self.resolver.resolve(stmt)
+            program.append((self.resolver.cost, self.compile(stmt)))
+        limits = self.limits
+        try:
+            if limits is None:
+                for _, closure in program:
+                    closure()
+            else:
+                limits.start()
+                for cost, closure in program:
+                    limits.charge(cost)
+                    closure()
+        finally:
+            self.out.flush()
+
+    def exec(self, stmt: Stmt) -> None:
+        self.compile(stmt)()
+
+    def compile(self, stmt: Stmt) -> Callable[[], None]:
+        evaluator = self.evaluator
+        if isinstance(stmt, PrintStmt):
+            expr = evaluator.compile(stmt.expr)
+            stringfy = evaluator.stringfy
+            line = self.out.line
+            return lambda: line(stringfy(expr()))
+        elif isinstance(stmt, ExprStmt):
+            return evaluator.compile(stmt.expr)
+        elif isinstance(stmt, Decl):
+            if stmt.slot < 0:
+                stmt.slot = evaluator.env.slot(stmt.name)
+            values = evaluator.env.values
+            slot = stmt.slot
+            if stmt.expr:
+                expr = evaluator.compile(stmt.expr)
+
+                def decl() -> None:
+                    values[slot] = expr()
+                return decl
+
+            def decl() -> None:
+                values[slot] = None
+            return decl
+        raise TypeError(f'Cannot compile {stmt}')
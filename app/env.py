@@ -1,15 +1,38 @@
 from typing import Any
 
+# value of a slot that was allocated but never assigned
+UNDEFINED: Any = object()
+
 
 class Env():
+    # variables live in an array of slots, the resolver maps every name
+    # to its slot once so evaluation indexes self.values directly
     def __init__(self) -> None:
-        self.env: dict[str, Any] = dict()
+        self.slots: dict[str, int] = dict()
+        self.names: list[str] = list()
+        self.values: list[Any] = list()
+
+    def slot(self, k: str) -> int:
+        if (slot := self.slots.get(k)) is None:
+            slot = self.slots[k] = len(self.values)
+            self.names.append(k)
+            self.values.append(UNDEFINED)
+        return slot
 
     def put(self, k: str, v: Any) -> None:
-        self.env[k] = v
+        self.values[self.slot(k)] = v
 
     def get(self, k: str) -> Any:
-        if k in self.env:
-            return self.env[k]
+        if k in self.slots:
+            return self.get_at(self.slots[k])
         else:
             raise RuntimeError(f'Undefined variable {k} .')
+
+    def put_at(self, slot: int, v: Any) -> None:
+        self.values[slot] = v
+
+    def get_at(self, slot: int) -> Any:
+        value = self.values[slot]
+        if value is UNDEFINED:
+            raise RuntimeError(f'Undefined variable {self.names[slot]} .')
+        return value
@@ -1,11 +1,130 @@
-from typing import Any
+import operator
+from typing import Any, Callable
 from app.AST import *
 from app.env import Env
+from app.limits import Limits
+from app.rope import ROPE_MIN, STRINGS, concat
+
+
+def add(left: Any, right: Any) -> Any:
+    if type(left) is type(right):
+        # two short strs are copied as before the rope, two ropes join by Rope.__add__
+        if type(left) is not str or len(left) + len(right) < ROPE_MIN:
+            return left + right
+        return concat(left, right)
+    if type(left) in STRINGS and type(right) in STRINGS:
+        return concat(left, right)
+    raise RuntimeError('Operands must be two numbers or two strings.')
+
+
+def subtract(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left - right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def multiply(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left * right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def divide(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left / right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def greater(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left > right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def greater_equal(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left >= right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def less(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left < right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def less_equal(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return left <= right
+    raise RuntimeError('Operands must be numbers.')
+
+
+def equal(left: Any, right: Any) -> Any:
+    return left == right
+
+
+def not_equal(left: Any, right: Any) -> Any:
+    return left != right
+
+
+def negate(value: Any) -> Any:
+    if isinstance(value, float):
+        return -value
+    raise RuntimeError('Operand must be a number.')
+
+
+def logical_not(value: Any) -> Any:
+    # !0 is true like any other falsy value, not sure about this behaviour yet
+    return not value
+
+
+BINARY_OPS: dict[TokenType, Callable[[Any, Any], Any]] = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+    TokenType.STAR: multiply,
+    TokenType.SLASH: divide,
+    TokenType.GREATER: greater,
+    TokenType.GREATER_EQUAL: greater_equal,
+    TokenType.LESS: less,
+    TokenType.LESS_EQUAL: less_equal,
+    TokenType.EQUAL_EQUAL: equal,
+    TokenType.BANG_EQUAL: not_equal,
+}
+
+# the operators on operands TypeInference proved to be numbers, unchecked
+NUMBER_OPS: dict[TokenType, Callable[[Any, Any], Any]] = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+UNARY_OPS: dict[TokenType, Callable[[Any], Any]] = {
+    TokenType.MINUS: negate,
+    TokenType.BANG: logical_not,
+}
 
 
 class Evaluator:
+    binary_ops: dict[TokenType, Callable[[Any, Any], Any]] = BINARY_OPS
+    # + of two operands proven to be strings
+    concat: Callable[[Any, Any], Any] = staticmethod(concat)
+
     def __init__(self) -> None:
         self.env = Env()
+
+    def limit(self, limits: Limits) -> None:
+        # with a string limit + checks the size of the string it would build
+        if limits.max_string:
+            def limited_add(left: Any, right: Any) -> Any:
+                limits.concat(left, right)
+                return add(left, right)
+            self.binary_ops = {**BINARY_OPS, TokenType.PLUS: limited_add}
+            self.concat = limited_add
     # f(B(B(1+2)*B(5-3)))
     #  └──f(B(1+2)) * f(B(5-3))
     #           └── 3 * 2
@@ -18,58 +137,29 @@ class Evaluator:
             return (expression.value)
 
         elif isinstance(expression, Binary):
-            op: str = expression.op
             left = self.evaluate(expression.lexpr)
-            right = self.evaluate(expression.rexpr)
-            if op == '==':
-                return left == right
-            if op == '!=':
-                return left != right
-            if op == '+':
-                if type(left) is type(right):
-                    return left + right
-                else:
-                    raise RuntimeError(
-                        'Operands must be two numbers or two strings.')
-            if isinstance(left, float) and isinstance(right, float):
-                if op == '-':
-                    return left - right
-                if op == '*':
-                    return left * right
-                if op == '/':
-                    return left / right
-                if op == '>':
-                    return left > right
-                if op == '<':
-                    return left < right
-                if op == '>=':
-                    return left >= right
-                if op == '<=':
-                    return left <= right
-            else:
-                raise RuntimeError('Operands must be numbers.')
+            if expression.operands:
+                # proven by TypeInference, UNKNOWN is 0
+                if expression.operands is Type.NUMBER:
+                    return NUMBER_OPS[expression.op](left, self.evaluate(expression.rexpr))
+                return self.concat(left, self.evaluate(expression.rexpr))
+            return self.binary_ops[expression.op](left, self.evaluate(expression.rexpr))
         elif isinstance(expression, Grouping):
             return self.evaluate(expression.expr)
         elif isinstance(expression, Unary):
-            op = expression.op
-            expr = self.evaluate(expression.expr)
-            if op == '!':
-                if isinstance(expr, float) and expr > 0:
-                    return False
-                if isinstance(expr, float) and expr == 0.0:
-                    return True  # not sure about this behaviour yet
-                return not (expr)
-            elif op == '-':
-                if isinstance(expr, float):
-                    return -expr
-                else:
-                    raise RuntimeError('Operand must be a number.')
+            if expression.operands:
+                return -self.evaluate(expression.expr)
+            return UNARY_OPS[expression.op](self.evaluate(expression.expr))
         elif isinstance(expression, Variable):
-            return self.env.get(expression.name)
+            if expression.slot < 0:
+                return self.env.get(expression.name)
+            return self.env.get_at(expression.slot)
         elif isinstance(expression, Assign):
-            name = expression.name
             value = self.evaluate(expression.expr)
-            self.env.put(name, value)
+            if expression.slot < 0:
+                self.env.put(expression.name, value)
+            else:
+                self.env.values[expression.slot] = value
             return value
 
     def stringfy(self, out: Any) -> str:
@@ -83,4 +173,7 @@ class Evaluator:
                 out = 'nil'
             else:
                 out = 'true' if out else 'false'
+        elif not isinstance(out, str):
+            # a Rope is joined here, true + true adds as python ints
+            out = str(out)
         return out
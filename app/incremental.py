@@ -0,0 +1,274 @@
+import itertools
+from app.AST import *
+from app.scanner import Err, Scanner, Token, TokenType
+from app.RDParser import Parser
+
+
+class Offsets:
+    # ascending offsets into a sequence edited in the middle, kept like a gap
+    # buffer: the ones from self.gap on are stored as their distance from
+    # self.total, so an edit at the gap leaves them as they are and only
+    # moving the gap converts the ones it passes. edits near each other, as
+    # typing makes them, touch few offsets
+    def __init__(self, values: list[int], total: int) -> None:
+        self.values = values
+        self.total = total
+        self.gap = len(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, i: int) -> int:
+        value = self.values[i]
+        return value if i < self.gap else self.total - value
+
+    def move(self, gap: int) -> None:
+        values, total = self.values, self.total
+        gap = min(gap, len(values))
+        lo, hi = min(gap, self.gap), max(gap, self.gap)
+        values[lo:hi] = [total - value for value in values[lo:hi]]
+        self.gap = gap
+
+    def replace(self, start: int, stop: int, values: list[int], total: int) -> None:
+        # values take the place of [start, stop), the sequence is total long
+        # now and the offsets after them move with its end
+        self.move(stop)
+        self.values[start:stop] = values
+        self.gap = start + len(values)
+        self.total = total
+
+    def bisect(self, value: int, lo: int = 0) -> int:
+        # the first index from lo with an offset of at least value
+        hi = len(self.values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class Document:
+    # a source kept scanned and parsed across edits, for an editor checking it
+    # on every keystroke. tokens, ret, stmts and error are what Scanner and
+    # Parser give for the whole text, but an edit only re-scans from the token
+    # before it until a new token ends where an old one did, and only
+    # re-parses the top level declarations from the one holding the first
+    # changed token until a new one starts where an old one did. the Token and
+    # Stmt objects around them are kept
+    #
+    # the lines of the tokens after an edit that adds or removes some are moved
+    # as the offsets are: the ones past a gap are off by a shift until the gap
+    # passes them. a declaration is moved when stmts asks for it, by as many
+    # lines as the token it starts at moved since it was parsed
+    #
+    # a declaration that fails to parse is kept as None up to where the next
+    # one can start, so the ones after it are kept too. its error is found
+    # again when asked for, the lines in the message may have moved
+    #
+    # scanning and parsing cost what the edit changed, the rest of an edit
+    # still grows with the file: the text is one str built again and the
+    # token and declaration lists are spliced, copies of the whole of them,
+    # and the gaps moved from the edit before cost a pass over the offsets
+    # and token lines between the two. far less than scanning and parsing
+    # again, but not independent of the size of the file
+    def __init__(self, text: str = '', scanner: type[Scanner] = Scanner) -> None:
+        self.scanner = scanner
+        self.text = ''
+        # the last token is EOF, ends holds where each of the others ends
+        self.all_tokens: list[Token] = [Token(TokenType.EOF, '', 'null', 2)]
+        self.ends = Offsets([], 0)
+        self.token_gap = 0
+        self.token_shift = 0
+        self.scan_errors = 0
+        # the top level declarations, the index of the token each starts at,
+        # how many failed and the index of the first one that did
+        self.segments: list[Stmt | None] = []
+        self.starts = Offsets([], 0)
+        self.parse_errors = 0
+        self.failed = 0
+        self.edit(0, 0, text)
+
+    @property
+    def tokens(self) -> list[Token]:
+        self.move_tokens(len(self.all_tokens))
+        return self.all_tokens
+
+    @property
+    def ret(self) -> int:
+        return 65 if self.scan_errors else 0
+
+    @property
+    def stmts(self) -> list[Stmt]:
+        # the declarations before the first that fails, as Parser.parse has them
+        tokens = self.tokens
+        stmts: list[Stmt] = self.segments[:self.failed]  # type: ignore[assignment]
+        for i, stmt in enumerate(stmts):
+            if shift := tokens[self.starts[i]].line - stmt.line:
+                renumber(stmt, shift)
+        return stmts
+
+    @property
+    def error(self) -> SyntaxError | None:
+        if self.failed == len(self.segments):
+            return None
+        # parsed again from copies of the tokens past the gap with their lines,
+        # so checking an edit far from the error does not move it there
+        tokens, gap, shift = self.all_tokens, self.token_gap, self.token_shift
+
+        def token(i: int) -> Token:
+            t = tokens[i]
+            if i < gap or not shift:
+                return t
+            return Token(t.type, t.lexme, t.literal, t.line + shift, t.err)
+        try:
+            Parser(map(token, itertools.count(self.starts[self.failed]))).decl()
+        except SyntaxError as e:
+            return e
+        raise AssertionError('a failed declaration parsed')
+
+    def move_tokens(self, gap: int) -> None:
+        tokens, shift = self.all_tokens, self.token_shift
+        if shift:
+            for token in tokens[self.token_gap:gap]:
+                token.line += shift
+            for token in tokens[gap:self.token_gap]:
+                token.line -= shift
+        self.token_gap = gap
+        if gap == len(tokens):
+            self.token_shift = 0
+
+    def token(self, i: int) -> Token:
+        # token i with its line
+        if i >= self.token_gap:
+            self.move_tokens(i + 1)
+        return self.all_tokens[i]
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> None:
+        # replaces deleted characters at offset by inserted
+        text = self.text
+        if not 0 <= offset <= offset + deleted <= len(text):
+            raise ValueError(f'Edit of {deleted} characters at {offset} is out of range.')
+        removed = text[offset:offset + deleted]
+        self.text = text[:offset] + inserted + text[offset + deleted:]
+        newlines = inserted.count('\n') - removed.count('\n')
+        start, stop, added = self.rescan(offset, deleted, len(inserted), newlines)
+        self.reparse(start, stop, added)
+
+    def rescan(self, offset: int, deleted: int, inserted: int, newlines: int) -> tuple[int, int, int]:
+        # returns the old tokens [start, stop) that were replaced and how many
+        # new ones took their place
+        tokens, ends = self.all_tokens, self.ends
+        count = len(tokens) - 1
+        delta = inserted - deleted
+        # the first token that ends at the edit or after it, the scanner starts
+        # at the end of the one before as it was there when scanning the file
+        start = ends.bisect(offset)
+        s = self.scanner(self.text)
+        pos = ends[start - 1] if start else 0
+        s.line_number = self.token(start - 1).line if start else 1
+        new: list[Token] = []
+        new_ends: list[int] = []
+        stop = start
+        while True:
+            token, pos = s.scan_token(pos)
+            if token is None:
+                stop = count
+                break
+            new.append(token)
+            new_ends.append(pos)
+            if pos >= offset + inserted:
+                # past the edit, where an old token ended the rest scans as before
+                stop = ends.bisect(pos - delta, stop)
+                if stop < count and ends[stop] == pos - delta:
+                    stop += 1
+                    break
+        self.scan_errors += (sum(token.err is not Err.NONE for token in new)
+                             - sum(tokens[i].err is not Err.NONE for i in range(start, stop)))
+        self.move_tokens(stop)
+        tokens[start:stop] = new
+        self.token_gap = start + len(new)
+        self.token_shift += newlines
+        if self.token_gap == len(tokens) - 1:
+            self.move_tokens(len(tokens))
+        ends.replace(start, stop, new_ends, len(self.text))
+        return start, stop, len(new)
+
+    def reparse(self, start: int, stop: int, added: int) -> None:
+        # the old tokens [start, stop) were replaced by added new ones
+        segments, starts = self.segments, self.starts
+        count = len(self.all_tokens) - 1
+        # the first declaration holding a replaced token, or the failed one
+        # right before them: where it ends depends on the token after it. the
+        # ones after the gap read their new starts from here on
+        first = max(starts.bisect(start + 1) - 1, 0)
+        if first and segments[first - 1] is None and starts[first] == start:
+            first -= 1
+        starts.move(first + 1)
+        starts.total = count
+        pos = starts[first] if segments else 0
+        new: list[Stmt | None] = []
+        new_starts: list[int] = []
+        last = first
+        while True:
+            if pos >= count:
+                last = len(segments)
+                break
+            new_starts.append(pos)
+            stmt, pos = self.parse(pos)
+            new.append(stmt)
+            if pos >= start + added:
+                # past the new tokens, where an old declaration started the rest
+                # parses as before
+                while last < len(segments) and starts[last] < pos:
+                    last += 1
+                if last < len(segments) and starts[last] == pos:
+                    break
+        self.parse_errors += (sum(stmt is None for stmt in new)
+                              - sum(segments[i] is None for i in range(first, last)))
+        segments[first:last] = new
+        starts.replace(first, last, new_starts, count)
+        # the first failed one, looked for from the edit if it was replaced
+        failed = self.failed
+        if failed >= last:
+            failed += len(new) - (last - first)
+        elif failed >= first:
+            failed = first
+            if not self.parse_errors:
+                failed = len(segments)
+            while failed < len(segments) and segments[failed] is not None:
+                failed += 1
+        for i, stmt in enumerate(new):
+            if stmt is None:
+                failed = min(failed, first + i)
+                break
+        self.failed = failed
+
+    def parse(self, index: int) -> tuple[Stmt | None, int]:
+        # the declaration at token index and the index of the token after it.
+        # one that fails to parse is None and runs from the error to after a ;
+        # or before the var or print starting the next one, as Lox synchronizes
+        tokens = self.all_tokens
+        parser = Parser(map(self.token, itertools.count(index)))
+        try:
+            stmt: Stmt | None = parser.decl()
+        except SyntaxError:
+            stmt = None
+        end = index
+        while tokens[end] is not parser.current:
+            end += 1
+        if stmt is None:
+            end = max(end, index + 1)
+            while (tokens[end - 1].type != TokenType.SEMICOLON
+                   and tokens[end].type not in (TokenType.VAR, TokenType.PRINT, TokenType.EOF)):
+                end += 1
+        return stmt, end
+
+
+def renumber(stmt: Stmt, shift: int) -> None:
+    # moves a declaration and its nodes shift lines
+    stmt.line += shift
+    if stmt.expr is not None:  # type: ignore[attr-defined]
+        for node in postorder(stmt.expr):  # type: ignore[attr-defined]
+            node.line += shift
@@ -0,0 +1,83 @@
+from typing import Iterable, Iterator
+from app.AST import *
+
+# the operators that check the types of their operands at run time
+CHECKED: set[TokenType] = {
+    TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH,
+    TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL,
+}
+COMPARISONS: set[TokenType] = {
+    TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL,
+}
+LITERALS: dict[type, Type] = {float: Type.NUMBER, str: Type.STRING, bool: Type.BOOL,
+                              type(None): Type.NIL}
+
+
+class TypeInference():
+    # follows the type of every variable through the statements in the order
+    # they run and marks the operations whose operands are proven numbers, or
+    # strings for +, in their operands field. there is no control flow yet so
+    # the last assignment before a read decides its type; a value of unknown
+    # type (never set, or from an operation that fails) leaves the checks on.
+    # self.operations counts the checked operators seen, self.specialized the
+    # ones marked
+    def __init__(self) -> None:
+        self.types: dict[str, Type] = {}
+        self.operations = 0
+        self.specialized = 0
+
+    def infer(self, stmts: Iterable[Stmt]) -> Iterator[Stmt]:
+        for stmt in stmts:
+            yield self.stmt(stmt)
+
+    def stmt(self, stmt: Stmt) -> Stmt:
+        if isinstance(stmt, (PrintStmt, ExprStmt)):
+            self.expr(stmt.expr)
+        elif isinstance(stmt, Decl):
+            self.types[stmt.name] = self.expr(stmt.expr) if stmt.expr else Type.NIL
+        return stmt
+
+    def expr(self, expr: Expr) -> Type:
+        # in post order, so an assignment is seen after the reads before it
+        stack: list[Type] = []
+        for node in postorder(expr):
+            kind = type(node)
+            if kind is Literal:
+                stack.append(LITERALS.get(type(node.value), Type.UNKNOWN))
+            elif kind is Variable:
+                stack.append(self.types.get(node.name, Type.UNKNOWN))
+            elif kind is Binary:
+                right = stack.pop()
+                stack.append(self.binary(node, stack.pop(), right))
+            elif kind is Unary:
+                stack.append(self.unary(node, stack.pop()))
+            elif kind is Assign:
+                self.types[node.name] = stack[-1]
+        return stack[-1]
+
+    def binary(self, node: Binary, left: Type, right: Type) -> Type:
+        op = node.op
+        if op in CHECKED:
+            self.operations += 1
+            if left == right == Type.NUMBER or (op == TokenType.PLUS and left == right == Type.STRING):
+                node.operands = left
+                self.specialized += 1
+            else:
+                # the operation fails, or adds booleans
+                node.operands = Type.UNKNOWN
+                return Type.UNKNOWN
+        if op in COMPARISONS:
+            return Type.BOOL
+        return left
+
+    def unary(self, node: Unary, operand: Type) -> Type:
+        if node.op == TokenType.BANG:
+            return Type.BOOL
+        self.operations += 1
+        if operand == Type.NUMBER:
+            node.operands = operand
+            self.specialized += 1
+            return operand
+        node.operands = Type.UNKNOWN
+        return Type.UNKNOWN
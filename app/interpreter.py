@@ -1,20 +1,44 @@
+from typing import Iterable
+from app.output import Output
+from app.limits import Limits
 from app.AST import Stmt
 from app.evaluator import Evaluator
+from app.resolver import Resolver
 from app.AST import *
 
 
 class Interpreter():
-    def __init__(self, stmts: list[Stmt]) -> None:
-        self.stmts: list[Stmt] = stmts
-        self.evaluator = Evaluator()
+    def __init__(self, stmts: Iterable[Stmt], evaluator: Evaluator | None = None,
+                 out: Output | None = None, limits: Limits | None = None) -> None:
+        # stmts may be a lazy stream (Parser.declarations), each statement
+        # is executed as soon as it is produced
+        self.stmts: Iterable[Stmt] = stmts
+        self.evaluator = evaluator or Evaluator()
+        self.resolver = Resolver(self.evaluator.env)
+        # printed lines are buffered in out, which is flushed when interpret
+        # returns or raises so errors are reported after the output before them
+        self.out = out or Output()
+        # each statement is charged against limits before it runs
+        self.limits = limits
+        if limits is not None:
+            self.evaluator.limit(limits)
 
     def interpret(self) -> None:
-        for stmt in self.stmts:
-            self.exec(stmt)
+        limits = self.limits
+        if limits is not None:
+            limits.start()
+        try:
+            for stmt in self.stmts:
+                stmt = self.resolver.resolve(stmt)
+                if limits is not None:
+                    limits.charge(self.resolver.cost)
+                self.exec(stmt)
+        finally:
+            self.out.flush()
 
     def exec(self, stmt: Stmt) -> None:
         if isinstance(stmt, PrintStmt):
-            print(self.stringfy(stmt.expr))
+            self.out.line(self.stringfy(stmt.expr))
         elif isinstance(stmt, ExprStmt):
             self.evaluator.evaluate(stmt.expr)
         if isinstance(stmt, Decl):
@@ -23,7 +47,10 @@ class Interpreter():
             else:
                 value = None
             # TODO may be impl singlton instead
-            self.evaluator.env.put(stmt.name, value)
+            if stmt.slot < 0:
+                self.evaluator.env.put(stmt.name, value)
+            else:
+                self.evaluator.env.values[stmt.slot] = value
 
     def stringfy(self, expr: Expr) -> str:
         out = self.evaluator.evaluate(expr)
@@ -0,0 +1,50 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+from app.rope import STRINGS
+
+
+class LimitError(RuntimeError):
+    # a run stopped by its Limits rather than by an error in the script
+    pass
+
+
+@dataclass
+class Limits:
+    # 0 leaves a limit off. a step is a node evaluated, they are charged a
+    # statement at a time before it runs (Resolver.cost) and the clock is only
+    # read every interval steps, so the checks cost next to nothing per node.
+    # the deadline is not looked at inside a statement, which has no loops
+    # and so runs in time bounded by its nodes and max_string
+    max_steps: int = 0
+    max_seconds: float = 0
+    max_string: int = 0
+    interval: int = 1024
+
+    def __post_init__(self) -> None:
+        self.start()
+
+    def start(self) -> None:
+        self.steps = 0
+        self.deadline = time.monotonic() + self.max_seconds
+        self.checkpoint = 0
+
+    def charge(self, steps: int) -> None:
+        self.steps += steps
+        if self.steps >= self.checkpoint:
+            self.check()
+
+    def check(self) -> None:
+        if self.max_steps and self.steps > self.max_steps:
+            raise LimitError(f'Step limit of {self.max_steps} exceeded.')
+        if self.max_seconds and time.monotonic() > self.deadline:
+            raise LimitError(f'Time limit of {self.max_seconds:g}s exceeded.')
+        self.checkpoint = self.steps + self.interval
+        if self.max_steps:
+            self.checkpoint = min(self.checkpoint, self.max_steps + 1)
+
+    def concat(self, left: Any, right: Any) -> None:
+        # called before two strings are added, so the result is never built
+        if (type(left) in STRINGS and type(right) in STRINGS
+                and len(left) + len(right) > self.max_string):
+            raise LimitError(f'String limit of {self.max_string} characters exceeded.')
@@ -1,92 +1,342 @@
+import io
+import json
+import os
 import sys
+from typing import IO, Any, Iterable
 
 from app.scanner import Scanner
+from app.regexscanner import RegexScanner
+from app.mappedscanner import MappedScanner, Source, map_file
+from app.parallel import scan_parallel
 from app.RDParser import Parser
-from app.evaluator import Evaluator
 from app.interpreter import Interpreter
+from app.vm import VM
+from app.closures import ClosureInterpreter
+from app.stackeval import StackInterpreter
+from app.transpiler import PythonInterpreter, program_tag
+from app.optimizer import Optimizer
+from app.inference import TypeInference
+from app.output import Output
+from app.limits import Limits, LimitError
+from app.profiler import Profile, ProfilingEvaluator, ProfilingInterpreter
+from app.stats import Stats, count_nodes
+from app.cache import ASTCache, DEFAULT_DIR, DEFAULT_SIZE
 from app.AST import *
 
 
-def main() -> None:
+def parse_args(argv: list[str]) -> tuple[list[str], dict[str, str]]:
+    # splits --name[=value] options from positional arguments
+    args: list[str] = []
+    options: dict[str, str] = {}
+    for arg in argv:
+        if arg.startswith('--'):
+            name, _, value = arg[2:].partition('=')
+            options[name] = value
+        else:
+            args.append(arg)
+    return args, options
+
+
+ENGINES: dict[str, type[Interpreter]] = {
+    'tree': Interpreter,
+    'vm': VM,
+    'closure': ClosureInterpreter,
+    'stack': StackInterpreter,
+    'python': PythonInterpreter,
+}
+
+SCANNERS: dict[str, type[Scanner]] = {
+    'loop': Scanner,
+    'regex': RegexScanner,
+}
+
 
-    if len(sys.argv) < 3:
+def main() -> None:
+    args, options = parse_args(sys.argv[1:])
+    if len(args) < 2:
         print("Usage: ./your_program.sh tokenize <filename>", file=sys.stderr)
         exit(1)
 
-    command = sys.argv[1]
-    filename = sys.argv[2]
+    # --buffer=chars flushes printed output every chars characters, 0 writes
+    # each line as it is printed; a terminal defaults to 0
+    threshold = int(options['buffer']) if options.get('buffer') else None
+    out = Output(threshold=threshold)
+    # --stats writes a JSON line of phase times, peak memory and counts to
+    # stderr, --stats=time leaves out memory and the tracing it slows runs with
+    stats = Stats('stats' in options, options.get('stats') != 'time')
+    try:
+        execute(args[0], args[1], options, out, stats=stats)
+    finally:
+        out.flush()
+        if stats.enabled:
+            out.error(json.dumps(stats.json(args[0])))
+
+
+def open_source(filename: str, source: str | None, mapped: bool = False) -> IO[Any]:
+    # the source text when it is given (serve), otherwise the file, in binary
+    # mode when it is to be mapped
+    if source is not None:
+        return io.StringIO(source)
+    if mapped:
+        return open(filename, 'rb')
+    return open(filename, encoding="utf-8")
+
+
+def read_source(file: IO[Any], mapped: bool) -> str | Source:
+    return map_file(file) if mapped else file.read()
+
 
-    if command == "tokenize":
-        with open(filename, encoding="utf-8") as file:
-            file_contents = file.read()
+def run_limits(options: dict[str, str]) -> Limits | None:
+    # --max-steps=N evaluated nodes, --max-time=seconds, --max-string=chars,
+    # a run that hits one exits with 75. steps and time are checked between
+    # statements: a statement that started runs to its end, and the time
+    # spent scanning and parsing the source is not counted
+    if not any(options.get(name) for name in ('max-steps', 'max-time', 'max-string')):
+        return None
+    return Limits(int(options.get('max-steps') or 0), float(options.get('max-time') or 0),
+                  int(options.get('max-string') or 0))
+
+
+def write_profile(profile: Profile, filename: str, out: Output) -> None:
+    if filename:
+        with open(filename, 'w', encoding="utf-8") as file:
+            json.dump(profile.json(), file, indent=1)
+    else:
+        out.error(profile.report())
+
+
+def execute(command: str, filename: str, options: dict[str, str], out: Output,
+            source: str | None = None, stats: Stats | None = None) -> None:
+    # runs one command on filename, or on source when it is given, its output
+    # goes to out and its exit code is raised with sys.exit. the phases it
+    # goes through are recorded in stats
+    stats = stats or Stats(enabled=False)
+    # --stream[=chunk_size] scans the file chunk by chunk and runs
+    # each statement as soon as it is parsed
+    stream = 'stream' in options
+    chunk_size = int(options.get('stream') or 1 << 16)
+    # --engine=tree|vm|closure|stack|python selects how run executes the parsed
+    # statements, and the evaluator evaluate uses
+    engine = options.get('engine') or 'tree'
+    if engine not in ENGINES:
+        out.error(f"Unknown engine: {engine}")
+        sys.exit(1)
+    # --scanner=loop|regex selects the handwritten scanner or the one
+    # matching a precompiled pattern, both give the same tokens
+    scanner = SCANNERS.get(options.get('scanner') or 'loop')
+    if scanner is None:
+        out.error(f"Unknown scanner: {options['scanner']}")
+        sys.exit(1)
+    # --mmap maps the file and scans its utf-8 bytes in place of reading and
+    # decoding it whole, only the lexemes of the tokens are decoded
+    mapped = 'mmap' in options and source is None
+    # --scan-jobs[=N] scans a large source in chunks on N worker processes,
+    # one per core when N is left out; the tokens are the same
+    scan_jobs = int(options.get('scan-jobs') or os.cpu_count() or 1) if 'scan-jobs' in options else 1
+    if mapped:
+        # the mapped bytes have a scanner of their own, scanned in this process
+        for option in ('scanner', 'scan-jobs'):
+            if option in options:
+                out.error(f"--mmap cannot be used with --{option}")
+                sys.exit(1)
+        scanner = MappedScanner
+    # --profile[=file] times run and evaluate node by node on the tree walker,
+    # the report goes to stderr or as JSON to file once they finish
+    profile = Profile() if 'profile' in options else None
+    if profile and engine != 'tree' and command in ("run", "evaluate"):
+        out.error("--profile needs --engine=tree")
+        sys.exit(1)
+
+    if command == "tokenize" and stream:
+        with open_source(filename, source, mapped) as file:
+            s = scanner(b'' if mapped else '')
+            with stats.phase('stream'):
+                for t in s.scan_stream(file, chunk_size):
+                    t.display(out)
+        sys.exit(s.ret)
+    elif command == "tokenize":
+        with open_source(filename, source, mapped) as file:
+            file_contents = read_source(file, mapped)
 
         if file_contents:
-            s = Scanner(file_contents)
-            s.scan()
-            for t in s.tokens:
-                t.display()
+            s = scanner(file_contents)
+            with stats.phase('scan'):
+                scan_parallel(s, scan_jobs)
+            stats.count('tokens', len(s.tokens))
+            with stats.phase('output'):
+                for t in s.tokens:
+                    t.display(out)
             sys.exit(s.ret)
         else:
             # Placeholder, replace this line when implementing the scanner
-            print("EOF  null")
+            out.line("EOF  null")
     elif command == "parse":
-        with open(filename, encoding="utf-8") as file:
-            file_contents = file.read()
+        with open_source(filename, source, mapped) as file:
+            file_contents = read_source(file, mapped)
 
         if file_contents:
-            s = Scanner(file_contents)
-            s.scan()
+            s = scanner(file_contents)
+            with stats.phase('scan'):
+                scan_parallel(s, scan_jobs)
+            stats.count('tokens', len(s.tokens))
             p = Parser(s.tokens)
             try:
-                ast = p.parse_expr()
-                out = print_ast(ast)
-                print(out)
+                with stats.phase('parse'):
+                    ast = p.parse_expr()
+                if stats.enabled:
+                    stats.count('nodes', len(postorder(ast)))
+                out.line(str(print_ast(ast)))
             except SyntaxError as e:
-                print(e, file=sys.stderr)
+                out.error(e)
                 sys.exit(65)
 
     elif command == "evaluate":
-        with open(filename, encoding="utf-8") as file:
-            file_contents = file.read()
+        with open_source(filename, source, mapped) as file:
+            file_contents = read_source(file, mapped)
 
         if file_contents:
-            s = Scanner(file_contents)
-            s.scan()
+            s = scanner(file_contents)
+            with stats.phase('scan'):
+                scan_parallel(s, scan_jobs)
+            stats.count('tokens', len(s.tokens))
             p = Parser(s.tokens)
             try:
-                ast: Expr = p.parse_expr()
-                evaluator = Evaluator()
-                out = evaluator.evaluate(ast)
-                out = evaluator.stringfy(out)
-                print(out)
+                with stats.phase('parse'):
+                    ast: Expr = p.parse_expr()
+                if stats.enabled:
+                    stats.count('nodes', len(postorder(ast)))
+                evaluator = ProfilingEvaluator(profile) if profile else ENGINES[engine](()).evaluator
+                with stats.phase('execute'):
+                    value = evaluator.evaluate(ast)
+                out.line(evaluator.stringfy(value))
             except SyntaxError as e:
-                print(e, file=sys.stderr)
+                out.error(e)
                 sys.exit(65)
             except RuntimeError as e:
-                print(e, file=sys.stderr)
+                out.error(e)
                 sys.exit(70)
+            finally:
+                if profile:
+                    write_profile(profile, options['profile'], out)
     elif command == "run":
-        with open(filename, encoding="utf-8") as file:
-            file_contents: str = file.read()
-
-        if file_contents:
-            s = Scanner(file_contents)
-            s.scan()
-            p = Parser(s.tokens)
+        with open_source(filename, source, mapped) as file:
+            stms: Iterable[Stmt]
+            optimizer = Optimizer()
+            optimize = 'optimize' in options
+            # --infer[=report] marks the operations whose operand types are
+            # known so the engines skip their checks, report prints the share
+            # of operations specialized on stderr
+            inference = TypeInference() if 'infer' in options else None
+            limits = run_limits(options)
+            cache = None
+            compiled = None
+            if stream:
+                s = scanner(b'' if mapped else '')
+                stms = Parser(s.scan_stream(file, chunk_size)).declarations()
+                if optimize:
+                    stms = optimizer.optimize(stms)
+                if inference:
+                    stms = inference.infer(stms)
+            else:
+                file_contents = read_source(file, mapped)
+                if not file_contents:
+                    return
+                # --cache[=dir] reuses the parsed statements of a source seen before,
+                # --cache-size=bytes bounds the cache directory
+                if 'cache' in options:
+                    cache = ASTCache(options['cache'] or DEFAULT_DIR,
+                                     int(options.get('cache-size') or DEFAULT_SIZE))
+                    key = cache.key(file_contents, optimize)
+                    if engine == 'python':
+                        # the python engine's compiled program is cached as well,
+                        # a hit skips scanning, parsing and compiling
+                        program_key = cache.key(file_contents, optimize,
+                                                program_tag(limits is not None, inference is not None))
+                entry = None
+                if cache:
+                    with stats.phase('cache'):
+                        if engine == 'python':
+                            compiled = cache.load_program(program_key)
+                        if not compiled:
+                            entry = cache.load(key)
+                if compiled:
+                    stms, optimizer.removed = [], compiled[1]
+                    if inference:
+                        inference.specialized, inference.operations = compiled[2]
+                elif entry:
+                    stms, optimizer.removed = entry
+                else:
+                    s = scanner(file_contents)
+                    with stats.phase('scan'):
+                        scan_parallel(s, scan_jobs)
+                    stats.count('tokens', len(s.tokens))
+                    p = Parser(s.tokens)
+                    try:
+                        with stats.phase('parse'):
+                            stms = p.parse()
+                    except SyntaxError as e:
+                        out.error(e)
+                        sys.exit(65)
+                    # --optimize[=report] folds constants before running,
+                    # report prints the number of removed nodes on stderr
+                    if optimize:
+                        with stats.phase('optimize'):
+                            stms = list(optimizer.optimize(stms))
+                    if cache:
+                        cache.store(key, stms, optimizer.removed)
+                # the cached statements are stored untyped, inference runs on them
+                # every time
+                if inference and not compiled:
+                    with stats.phase('infer'):
+                        stms = list(inference.infer(stms))
+                if stats.enabled and not compiled:
+                    stats.count('nodes', count_nodes(stms))
+            if profile:
+                interpreter = ProfilingInterpreter(stms, out, limits, profile)
+            else:
+                interpreter = ENGINES[engine](stms, out=out, limits=limits)
+            if compiled:
+                interpreter.program = compiled[0]
             try:
-                stms: list[Stmt] = p.parse()
+                # streamed statements are scanned and parsed as they run
+                with stats.phase('stream' if stream else 'execute'):
+                    interpreter.interpret()
             except SyntaxError as e:
-                print(e, file=sys.stderr)
+                out.error(e)
                 sys.exit(65)
-            interpreter = Interpreter(stms)
-            try:
-                interpreter.interpret()
+            except LimitError as e:
+                out.error(e)
+                sys.exit(75)
             except RuntimeError as e:
-                print(e, file=sys.stderr)
+                out.error(e)
                 sys.exit(70)
+            finally:
+                if profile:
+                    write_profile(profile, options['profile'], out)
+                if cache and engine == 'python' and not compiled and interpreter.program:
+                    inferred = (inference.specialized, inference.operations) if inference else (0, 0)
+                    cache.store_program(program_key, interpreter.program, optimizer.removed, inferred)
+            if options.get('optimize') == 'report':
+                out.error(f'Optimizer removed {optimizer.removed} nodes.')
+            if inference and options['infer'] == 'report':
+                share = inference.specialized / inference.operations if inference.operations else 0.0
+                out.error(f'Type inference specialized {inference.specialized} of '
+                          f'{inference.operations} operations ({share:.0%}).')
+    elif command == "batch":
+        # batch <directory|manifest> runs each script like run and writes a JSON
+        # line of its exit code, stdout and stderr; --jobs=N worker processes,
+        # one per CPU by default. multiprocessing is imported here for it
+        from app.batch import batch
+        batch(filename, options, out, execute, int(options.get('jobs') or 0))
+    elif command == "serve":
+        # serve <socket> answers JSON line requests on a unix socket, see Server.
+        # asyncio is imported here, the other commands do without its startup
+        import asyncio
+        from app.server import Server
+        asyncio.run(Server(filename, options, execute).serve())
     else:
-        print(f"Unknown command: {command}", file=sys.stderr)
-        exit(1)
+        out.error(f"Unknown command: {command}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+import mmap
+import os
+import re
+from typing import BinaryIO, Iterator
+from app.scanner import Scanner, Token, TokenType
+
+# a source file as bytes: mapped, or empty (an empty file cannot be mapped)
+Source = bytes | mmap.mmap
+
+# the bytes form of RegexScanner.TOKEN. open(encoding="utf-8") reads \r\n and
+# \r as \n, here \r is skipped as whitespace, ends a comment and is counted as
+# a line break unless a \n follows it. every byte past ascii is part of a
+# multi-byte utf-8 character, an identifier or number running into one and
+# any character outside the classes below are scanned from decoded text
+TOKEN = re.compile(rb'''
+    (?P<skip>[ \t\n\r\x0b\x0c\x1c-\x1f]*+(?://[^\r\n]*+[ \t\n\r\x0b\x0c\x1c-\x1f]*+)*+)
+    (?:
+        (?P<identifier>[A-Za-z_][A-Za-z0-9_]*+)(?![\x80-\xff])
+      | (?P<number>(?>[0-9]+(?:\.[0-9]*)?))(?![\x80-\xff])
+      | (?P<string>"[^"]*")
+      | (?P<operator>[!=<>]=?|[(){}*.,+\-;/])
+    )?
+''', re.VERBOSE)
+LINE_END = re.compile(rb'[\r\n]')
+# a mapped file lets go of the pages it has scanned every this many bytes, so
+# a streamed file does not stay resident as a whole. they are read in again
+# from the page cache if needed
+RELEASE = 1 << 20
+
+
+def map_file(file: BinaryIO) -> Source:
+    # the whole file mapped read only, pages are read in as they are scanned
+    if os.fstat(file.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def newlines(text: str) -> str:
+    # the universal newlines of a text file
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class MappedScanner(Scanner):
+    # the tokens, lines and errors of Scanner over the utf-8 bytes of a mapped
+    # file, without decoding the file or copying it into a str first. only
+    # the lexemes of identifiers, numbers and strings are decoded, keywords
+    # and operators come from a table. whatever the pattern does not match is
+    # decoded a character or a line at a time and left to Scanner.scan_token
+    def __init__(self, data: Source = b'') -> None:
+        super().__init__('')
+        self.data = data
+        # keywords and operators by their bytes
+        self.words: dict[bytes, tuple[TokenType, str]] = {
+            lexme.encode(): (type, lexme) for lexme, type in self.lexmes.items()}
+
+    def scan(self) -> None:
+        self.line_number += 1
+        self.tokens.extend(self.lex())
+        self.add_token(Token(TokenType.EOF, '', 'null', self.line_number + 1))
+
+    def scan_stream(self, file: BinaryIO, chunk_size: int = 0) -> Iterator[Token]:  # type: ignore[override]
+        # file is opened in binary mode and mapped whole, there are no chunks
+        self.data = map_file(file)
+        self.line_number += 1
+        yield from self.lex()
+        yield Token(TokenType.EOF, '', 'null', self.line_number + 1)
+
+    def lex(self) -> Iterator[Token]:
+        data = self.data
+        end = len(data)
+        match = TOKEN.match
+        words = self.words
+        release = data.madvise if isinstance(data, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED') else None
+        released = RELEASE
+        IDENTIFIER, NUMBER, STRING = TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING
+        line = self.line_number
+        pos = 0
+        while pos < end:
+            if pos > released and release:
+                released = pos - pos % mmap.PAGESIZE
+                release(mmap.MADV_DONTNEED, 0, released)
+                released += RELEASE
+            m = match(data, pos)
+            start, pos = m.span(1)
+            if start != pos:
+                line += self.lines(data[start:pos])
+            kind = m.lastindex
+            if kind == 2:
+                word = m[2]
+                if (known := words.get(word)):
+                    yield Token(known[0], known[1], 'null', line)
+                else:
+                    yield Token(IDENTIFIER, word.decode('ascii'), 'null', line)
+            elif kind == 5:
+                known = words[m[5]]
+                yield Token(known[0], known[1], 'null', line)
+            elif kind == 3:
+                digits = m[3]
+                yield Token(NUMBER, digits.decode('ascii'), float(digits), line)
+            elif kind == 4:
+                raw = m[4]
+                line += self.lines(raw)
+                lexme = raw.decode('utf-8')
+                if '\r' in lexme:
+                    lexme = newlines(lexme)
+                yield Token(STRING, lexme, lexme[1:-1], line)
+            elif pos < end:
+                self.line_number = line
+                token, pos = self.fallback(pos)
+                line = self.line_number
+                if token:
+                    yield token
+                continue
+            pos = m.end()
+        self.line_number = line
+
+    def lines(self, raw: bytes) -> int:
+        # lone \r are line breaks as well
+        if b'\r' in raw:
+            return raw.count(b'\n') + raw.count(b'\r') - raw.count(b'\r\n')
+        return raw.count(b'\n')
+
+    def fallback(self, pos: int) -> tuple[Token | None, int]:
+        # a quote the pattern left is an unterminated string, other than that
+        # the character at pos is whitespace or starts a token of the rest of
+        # its line (tokens end at a line break, strings aside)
+        data = self.data
+        lead = data[pos]
+        if lead == 0x22:
+            # it takes the rest of the file, the error has the line of its end
+            self.line_number += self.lines(data[pos:])
+            self.content = '"'
+            token, _ = Scanner.scan_token(self, 0)
+            self.content = ''
+            return token, len(data)
+        width = 1 if lead < 0x80 else 2 if lead < 0xe0 else 3 if lead < 0xf0 else 4
+        if data[pos:pos + width].decode('utf-8').isspace():
+            return None, pos + width
+        eol = LINE_END.search(data, pos)
+        self.content = data[pos:eol.start() if eol else len(data)].decode('utf-8')
+        token, used = Scanner.scan_token(self, 0)
+        pos += len(self.content[:used].encode('utf-8'))
+        self.content = ''
+        return token, pos
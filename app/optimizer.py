@@ -0,0 +1,72 @@
+from typing import Iterable, Iterator
+from app.AST import *
+from app.evaluator import Evaluator
+from app.rope import Rope
+
+
+class Optimizer():
+    # folds literal-only subexpressions and drops redundant nodes before
+    # execution, self.removed counts the nodes taken out of the tree.
+    # a subexpression whose evaluation fails is kept as is so the error
+    # still happens at run time
+
+    def __init__(self) -> None:
+        self.removed = 0
+        self.evaluator = Evaluator()
+
+    def optimize(self, stmts: Iterable[Stmt]) -> Iterator[Stmt]:
+        for stmt in stmts:
+            yield self.stmt(stmt)
+
+    def stmt(self, stmt: Stmt) -> Stmt:
+        if isinstance(stmt, PrintStmt):
+            return PrintStmt(self.fold(stmt.expr), stmt.line)
+        elif isinstance(stmt, ExprStmt):
+            return ExprStmt(self.fold(stmt.expr), stmt.line)
+        elif isinstance(stmt, Decl) and stmt.expr:
+            return Decl(stmt.name, self.fold(stmt.expr), stmt.slot, stmt.line)
+        return stmt
+
+    def fold(self, expr: Expr) -> Expr:
+        # in post order over a stack of the folded operands, so any depth fits
+        stack: list[Expr] = []
+        for node in postorder(expr):
+            if isinstance(node, Grouping):
+                # (x) evaluates exactly like x, its folded operand stays
+                self.removed += 1
+            elif isinstance(node, Binary):
+                right = stack.pop()
+                folded: Expr = Binary(stack.pop(), right, node.op, node.line)
+                if isinstance(folded.lexpr, Literal) and isinstance(folded.rexpr, Literal):
+                    folded = self.constant(folded, 2)
+                stack.append(folded)
+            elif isinstance(node, Unary):
+                operand = stack.pop()
+                if node.op == TokenType.BANG:
+                    # the operand of ! is a boolean context, there !!x is the same as x
+                    while self.is_not(operand) and self.is_not(operand.expr):
+                        self.removed += 2
+                        operand = operand.expr.expr
+                folded = Unary(node.op, operand, node.line)
+                if isinstance(operand, Literal):
+                    folded = self.constant(folded, 1)
+                stack.append(folded)
+            elif isinstance(node, Assign):
+                stack.append(Assign(node.name, stack.pop(), node.slot, node.line))
+            else:
+                stack.append(node)
+        return stack[-1]
+
+    def is_not(self, expr: Expr) -> bool:
+        return isinstance(expr, Unary) and expr.op == TokenType.BANG
+
+    def constant(self, expr: Binary | Unary, operands: int) -> Expr:
+        try:
+            value = self.evaluator.evaluate(expr)
+        except Exception:
+            return expr
+        if type(value) is Rope:
+            # literals hold plain strings, the cache marshals them
+            value = str(value)
+        self.removed += operands
+        return Literal(value, expr.line)
@@ -0,0 +1,40 @@
+import sys
+from typing import Any, TextIO
+
+# characters buffered before they are written out
+DEFAULT_THRESHOLD = 1 << 16
+
+
+class Output:
+    # collects printed lines and writes them to stream in one call once
+    # threshold characters are pending, instead of a write per print.
+    # errors go to the errors stream right after the pending lines, so the
+    # two stay in order when they end up in the same file or pipe
+    def __init__(self, stream: TextIO | None = None, errors: TextIO | None = None,
+                 threshold: int | None = None) -> None:
+        self.stream: TextIO = sys.stdout if stream is None else stream
+        self.errors: TextIO = sys.stderr if errors is None else errors
+        if threshold is None:
+            # a terminal sees every line as soon as it is printed
+            threshold = 0 if self.stream.isatty() else DEFAULT_THRESHOLD
+        self.threshold = threshold
+        self.lines: list[str] = []
+        self.size = 0
+
+    def line(self, text: str) -> None:
+        self.lines.append(text)
+        self.size += len(text) + 1
+        if self.size >= self.threshold:
+            self.flush()
+
+    def error(self, message: Any) -> None:
+        self.flush()
+        print(message, file=self.errors, flush=True)
+
+    def flush(self) -> None:
+        if self.lines:
+            self.lines.append('')
+            self.stream.write('\n'.join(self.lines))
+            self.lines.clear()
+            self.size = 0
+        self.stream.flush()
@@ -0,0 +1,84 @@
+import re
+from functools import partial
+from itertools import starmap
+from typing import Any
+from app.scanner import Scanner, Token, TokenType
+
+# the source is cut in about 4 chunks per worker so a slow one evens out, none
+# shorter than this: starting the workers and sending the tokens back costs
+# more than scanning a small source
+CHUNK_MIN = 1 << 18
+
+# the text from a safe offset up to endpos outside strings and comments. it
+# stops before a string or comment endpos cuts, except after the first / of
+# a comment cut between its slashes
+SKIP = re.compile(r'(?:[^"/]++|"[^"]*+"|//[^\n]*+(?=\n)|/(?!/))*+')
+# from a safe offset to the next newline outside strings and comments, there
+# is none after an unterminated string
+LINE = re.compile(r'(?:[^"/\n]++|"[^"]*+"|//[^\n]*+|/)*+\n')
+
+
+def boundaries(content: str, parts: int) -> list[int]:
+    # offsets from 0 to len(content) that cut content into at most parts
+    # chunks of about the same size, each one right after a newline outside
+    # strings and comments where a scanner starts as at the beginning of a
+    # file. one pass of the two patterns over the quotes and slashes
+    end = len(content)
+    offsets = [0]
+    for i in range(1, parts):
+        start = offsets[-1]
+        target = end * i // parts
+        if target <= start:
+            continue
+        pos = SKIP.match(content, start, target).end()
+        if pos > start and content.startswith('//', pos - 1):
+            pos -= 1
+        m = LINE.match(content, pos)
+        if m is None:
+            break
+        if m.end() < end:
+            offsets.append(m.end())
+    offsets.append(end)
+    return offsets
+
+
+def scan_chunk(scanner: type[Scanner], chunk: tuple[int, str]) -> tuple[list[tuple[Any, ...]], int]:
+    # the tokens of the text of one chunk starting after line, as tuples of
+    # Token's arguments: they pickle faster than Token objects and the enums
+    # in them are sent once. and ret
+    line, text = chunk
+    s = scanner(text)
+    s.line_number = line
+    s.scan()
+    s.tokens.pop()
+    return [(t.type, t.lexme, t.literal, t.line, t.err) for t in s.tokens], s.ret
+
+
+def scan_parallel(s: Scanner, jobs: int) -> None:
+    # does what s.scan() does with the source cut at boundaries and the chunks
+    # scanned by jobs worker processes, each told the lines before it. the
+    # tokens are put back together in order. a batch or serve worker is a
+    # daemon process, which cannot start workers of its own: it scans alone
+    content = s.content
+    if jobs > 1:
+        # a scan without workers, the usual one, does without multiprocessing
+        import multiprocessing
+        if multiprocessing.current_process().daemon:
+            jobs = 1
+    parts = min(jobs * 4, len(content) // CHUNK_MIN) if isinstance(content, str) else 0
+    offsets = boundaries(content, parts) if jobs > 1 and parts > 1 else []
+    if len(offsets) < 3:
+        s.scan()
+        return
+    chunks: list[tuple[int, str]] = []
+    line = s.line_number
+    for start, end in zip(offsets, offsets[1:]):
+        chunks.append((line, content[start:end]))
+        # Scanner counts every newline, in strings and comments as well
+        line += content.count('\n', start, end)
+    with multiprocessing.Pool(min(jobs, len(chunks))) as pool:
+        for tokens, ret in pool.imap(partial(scan_chunk, type(s)), chunks):
+            s.tokens.extend(starmap(Token, tokens))
+            s.ret = s.ret or ret
+    s.line_number = line + 1
+    s.add_token(Token(TokenType.EOF, '', 'null', s.line_number + 1))
@@ -0,0 +1,87 @@
+import time
+from typing import Any, Iterable
+from app.AST import *
+from app.evaluator import Evaluator
+from app.interpreter import Interpreter
+from app.limits import Limits
+from app.output import Output
+
+CATEGORIES = ('node', 'op', 'line')
+
+
+class Profile:
+    # call count, cumulative seconds (with the nodes below) and self seconds
+    # per AST node type, operator and source line
+    def __init__(self) -> None:
+        self.counters: dict[str, dict[Any, list]] = {category: {} for category in CATEGORIES}
+        # time spent in the nodes below each node being timed
+        self.children: list[float] = [0.0]
+
+    def enter(self) -> None:
+        self.children.append(0.0)
+
+    def leave(self, node: Expr | Stmt, seconds: float) -> None:
+        own = seconds - self.children.pop()
+        self.children[-1] += seconds
+        self.add('node', type(node).__name__, seconds, own)
+        if isinstance(node, (Binary, Unary)):
+            self.add('op', OPERATORS[node.op], seconds, own)
+        self.add('line', node.line, seconds, own)
+
+    def add(self, category: str, key: Any, seconds: float, own: float) -> None:
+        counter = self.counters[category].get(key)
+        if counter is None:
+            counter = self.counters[category][key] = [0, 0.0, 0.0]
+        counter[0] += 1
+        counter[1] += seconds
+        counter[2] += own
+
+    def json(self) -> dict[str, dict[str, dict[str, float]]]:
+        return {category: {str(key): {'calls': calls, 'total': total, 'self': own}
+                           for key, (calls, total, own) in counters.items()}
+                for category, counters in self.counters.items()}
+
+    def report(self) -> str:
+        # one table per category, most self time first
+        tables: list[str] = []
+        for category, counters in self.counters.items():
+            lines = [f'{category:<14} {"calls":>10} {"total s":>10} {"self s":>10}']
+            for key, (calls, total, own) in sorted(counters.items(), key=lambda item: -item[1][2]):
+                lines.append(f'{key!s:<14} {calls:>10} {total:>10.6f} {own:>10.6f}')
+            tables.append('\n'.join(lines))
+        return '\n\n'.join(tables)
+
+
+class ProfilingEvaluator(Evaluator):
+    # Evaluator timing every node it evaluates, evaluate recurses through
+    # self so the nodes below are timed too
+    def __init__(self, profile: Profile) -> None:
+        super().__init__()
+        self.profile = profile
+
+    def evaluate(self, expression: Expr) -> Any:
+        profile = self.profile
+        profile.enter()
+        start = time.perf_counter()
+        try:
+            return super().evaluate(expression)
+        finally:
+            profile.leave(expression, time.perf_counter() - start)
+
+
+class ProfilingInterpreter(Interpreter):
+    # the tree walking Interpreter with every statement and node timed, used in
+    # place of it only when profiling so the plain engines pay nothing
+    def __init__(self, stmts: Iterable[Stmt], out: Output | None = None,
+                 limits: Limits | None = None, profile: Profile | None = None) -> None:
+        self.profile = profile or Profile()
+        super().__init__(stmts, ProfilingEvaluator(self.profile), out, limits)
+
+    def exec(self, stmt: Stmt) -> None:
+        profile = self.profile
+        profile.enter()
+        start = time.perf_counter()
+        try:
+            super().exec(stmt)
+        finally:
+            profile.leave(stmt, time.perf_counter() - start)
@@ -0,0 +1,88 @@
+import re
+from app.scanner import Scanner, Token, TokenType
+
+# whitespace and comments before a token, then the token. only ascii is
+# matched here: str.isspace, isdigit and isalpha take in unicode characters
+# the classes below leave out, an identifier or number running into one
+# does not match at all (the possessive and atomic groups keep it from
+# backing off to a shorter match) so Scanner.scan_token scans it instead
+TOKEN = re.compile(r'''
+    (?P<skip>[ \t\n\r\x0b\x0c\x1c-\x1f]*+(?://[^\n]*+[ \t\n\r\x0b\x0c\x1c-\x1f]*+)*+)
+    (?:
+        (?P<identifier>[A-Za-z_][A-Za-z0-9_]*+)(?![^\x00-\x7f])
+      | (?P<number>(?>[0-9]+(?:\.[0-9]*)?))(?![^\x00-\x7f])
+      | (?P<string>"[^"]*")
+      | (?P<operator>[!=<>]=?|[(){}*.,+\-;/])
+    )?
+''', re.VERBOSE)
+
+
+class RegexScanner(Scanner):
+    # the same tokens, lines and errors as Scanner from one precompiled
+    # pattern matching the skipped text and the token in a single call;
+    # whatever it does not match (unexpected or non ascii characters, an
+    # unterminated string) is left to Scanner.scan_token
+    def scan(self) -> None:
+        content = self.content
+        end = len(content)
+        append = self.tokens.append
+        match = TOKEN.match
+        lexmes = self.lexmes
+        count = content.count
+        IDENTIFIER, NUMBER, STRING = TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING
+        line = self.line_number + 1
+        pos = 0
+        while pos < end:
+            m = match(content, pos)
+            start, pos = m.span(1)
+            if start != pos:
+                line += count('\n', start, pos)
+            # the group the token matched, 1 when there is none
+            kind = m.lastindex
+            if kind == 2:
+                lexme = m[2]
+                append(Token(lexmes.get(lexme, IDENTIFIER), lexme, 'null', line))
+            elif kind == 5:
+                lexme = m[5]
+                append(Token(lexmes[lexme], lexme, 'null', line))
+            elif kind == 3:
+                lexme = m[3]
+                append(Token(NUMBER, lexme, float(lexme), line))
+            elif kind == 4:
+                lexme = m[4]
+                line += count('\n', pos, m.end())
+                append(Token(STRING, lexme, lexme[1:-1], line))
+            elif pos < end:
+                self.line_number = line
+                token, pos = Scanner.scan_token(self, pos)
+                line = self.line_number
+                if token:
+                    append(token)
+                continue
+            pos = m.end()
+
+        self.line_number = line
+        self.add_token(Token(TokenType.EOF, '', 'null', line + 1))
+
+    def scan_token(self, pos: int) -> tuple[Token | None, int]:
+        # scan_stream scans a token at a time through here
+        content = self.content
+        m = TOKEN.match(content, pos)
+        start, pos = m.span(1)
+        self.line_number += content.count('\n', start, pos)
+        kind = m.lastgroup
+        if kind == 'skip' or kind is None:
+            if pos < len(content):
+                return super().scan_token(pos)
+            return None, pos
+        lexme = m[kind]
+        if kind == 'identifier':
+            token = Token(self.lexmes.get(lexme, TokenType.IDENTIFIER), lexme, 'null', self.line_number)
+        elif kind == 'operator':
+            token = Token(self.lexmes[lexme], lexme, 'null', self.line_number)
+        elif kind == 'number':
+            token = Token(TokenType.NUMBER, lexme, float(lexme), self.line_number)
+        else:
+            self.line_number += lexme.count('\n')
+            token = Token(TokenType.STRING, lexme, lexme[1:-1], self.line_number)
+        return token, m.end()
@@ -0,0 +1,30 @@
+from app.AST import *
+from app.env import Env
+
+
+class Resolver():
+    # gives every Decl, Variable and Assign the index of its slot in env,
+    # there is a single global scope until blocks and functions land
+    def __init__(self, env: Env) -> None:
+        self.env = env
+        # nodes in the last resolved statement, the steps running it costs
+        self.cost = 0
+
+    def resolve(self, stmt: Stmt) -> Stmt:
+        self.cost = 1
+        if isinstance(stmt, (PrintStmt, ExprStmt)):
+            self.resolve_expr(stmt.expr)
+        elif isinstance(stmt, Decl):
+            if stmt.expr:
+                self.resolve_expr(stmt.expr)
+            stmt.slot = self.env.slot(stmt.name)
+        return stmt
+
+    def resolve_expr(self, expr: Expr) -> None:
+        # post order so slots are handed out as evaluation first meets the names
+        slot = self.env.slot
+        order = postorder(expr)
+        self.cost += len(order)
+        for node in order:
+            if isinstance(node, (Variable, Assign)):
+                node.slot = slot(node.name)
@@ -0,0 +1,71 @@
+from typing import Any
+
+# strings at least this long are joined lazily, shorter ones are copied by +
+# as before since copying them costs less than keeping their pieces: a copy
+# of a few kB is a memcpy, a Rope append a few python calls
+ROPE_MIN = 1 << 15
+
+
+class Rope:
+    # a Lox string built by +, kept as the pieces it was joined from until its
+    # text is needed. ropes share their list of pieces: adding to the rope
+    # that ends it appends in place, so s = s + x costs the size of x instead
+    # of a copy of s. a rope that no longer ends the list (another one was
+    # built from it) copies its own pieces first
+    __slots__ = ('parts', 'size', 'length', 'text')
+
+    def __init__(self, parts: list[str], length: int) -> None:
+        self.parts = parts
+        self.size = len(parts)
+        self.length = length
+        self.text: str | None = None
+
+    def __add__(self, other: Any) -> 'Rope':
+        if type(other) is Rope:
+            other = str(other)
+        elif type(other) is not str:
+            return NotImplemented
+        parts = self.parts
+        if len(parts) != self.size:
+            parts = parts[:self.size]
+        parts.append(other)
+        return Rope(parts, self.length + len(other))
+
+    def __radd__(self, other: Any) -> 'Rope':
+        if type(other) is not str:
+            return NotImplemented
+        return Rope([other, str(self)], len(other) + self.length)
+
+    def __str__(self) -> str:
+        if self.text is None:
+            self.text = ''.join(self.parts[:self.size])
+            # adding to it from now on starts from the joined text
+            self.parts = [self.text]
+            self.size = 1
+        return self.text
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is Rope or type(other) is str:
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f'Rope({str(self)!r})'
+
+
+STRINGS = (str, Rope)
+
+
+def concat(left: str | Rope, right: str | Rope) -> str | Rope:
+    # + of two Lox strings, either one may be a str or a Rope
+    if type(left) is Rope:
+        return left + right
+    if len(left) + len(right) < ROPE_MIN:
+        return left + str(right)
+    return Rope([left, str(right)], len(left) + len(right))
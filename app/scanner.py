@@ -1,6 +1,6 @@
-from enum import Enum, auto
-from typing import Any
-import sys
+from enum import Enum, IntEnum, auto
+from typing import Any, Iterator, TextIO
+from app.output import Output
 
 
 class Err(Enum):
@@ -9,26 +9,73 @@ class Err(Enum):
     UNTERMINATED_STRING = auto()
 
 
+class TokenType(IntEnum):
+    # the name is only used for display
+    LEFT_PAREN = auto()
+    RIGHT_PAREN = auto()
+    LEFT_BRACE = auto()
+    RIGHT_BRACE = auto()
+    STAR = auto()
+    DOT = auto()
+    COMMA = auto()
+    PLUS = auto()
+    MINUS = auto()
+    SEMICOLON = auto()
+    SLASH = auto()
+    EQUAL = auto()
+    BANG = auto()
+    BANG_EQUAL = auto()
+    EQUAL_EQUAL = auto()
+    LESS_EQUAL = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    GREATER = auto()
+    AND = auto()
+    CLASS = auto()
+    ELSE = auto()
+    FALSE = auto()
+    FOR = auto()
+    FUN = auto()
+    IF = auto()
+    NIL = auto()
+    OR = auto()
+    PRINT = auto()
+    RETURN = auto()
+    SUPER = auto()
+    THIS = auto()
+    TRUE = auto()
+    VAR = auto()
+    WHILE = auto()
+    IDENTIFIER = auto()
+    STRING = auto()
+    NUMBER = auto()
+    EOF = auto()
+    # unexpected characters and unterminated strings
+    ERROR = auto()
+
+
 class Token:
-    def __init__(self, type: str, lexme: str, literal: Any, line: int, err: Err = Err.NONE) -> None:
-        self.type: str = type
+    __slots__ = ('type', 'lexme', 'literal', 'line', 'err')
+
+    def __init__(self, type: TokenType, lexme: str, literal: Any, line: int, err: Err = Err.NONE) -> None:
+        self.type: TokenType = type
         self.lexme: str = lexme
         self.literal: Any = literal
         self.line: int = line
         self.err: Err = err
 
     def __str__(self) -> str:
-        return f'{self.type} {self.lexme} {self.literal}'
+        return f'{self.type.name} {self.lexme} {self.literal}'
 
-    def display(self) -> None:
+    def display(self, out: Output) -> None:
         if self.err == Err.UNEXPECTED_CHAR:
-            print(
-                f'[line {self.line}] Error: Unexpected character: {self.lexme}', file=sys.stderr)
+            out.error(
+                f'[line {self.line}] Error: Unexpected character: {self.lexme}')
         elif self.err == Err.UNTERMINATED_STRING:
-            print(
-                f'[line {self.line}] Error: Unterminated string.', file=sys.stderr)
+            out.error(
+                f'[line {self.line}] Error: Unterminated string.')
         else:
-            print(self)
+            out.line(str(self))
 
 
 class Scanner:
@@ -36,120 +83,143 @@ class Scanner:
         self.content: str = content
         self.tokens: list[Token] = list()
         self.line_number: int = 0
-        self.lexmes: dict[str, str] = {
-            '(': 'LEFT_PAREN',
-            ')': 'RIGHT_PAREN',
-            '{': 'LEFT_BRACE',
-            '}': 'RIGHT_BRACE',
-            '*': 'STAR',
-            '.': 'DOT',
-            ',': 'COMMA',
-            '+': 'PLUS',
-            '-': 'MINUS',
-            ';': 'SEMICOLON',
-            '/': 'SLASH',
-            '=': 'EQUAL',
-            '!': 'BANG',
-            "!=": "BANG_EQUAL",
-            "==": "EQUAL_EQUAL",
-            "<=": "LESS_EQUAL",
-            ">=": "GREATER_EQUAL",
-            "<": "LESS",
-            ">": "GREATER",
-            "and":    "AND",
-            "class":  "CLASS",
-            "else":   "ELSE",
-            "false":  "FALSE",
-            "for":    "FOR",
-            "fun":    "FUN",
-            "if":     "IF",
-            "nil":    "NIL",
-            "or":     "OR",
-            "print":  "PRINT",
-            "return": "RETURN",
-            "super":  "SUPER",
-            "this":   "THIS",
-            "true":   "TRUE",
-            "var":    "VAR",
-            "while":  "WHILE"
+        self.lexmes: dict[str, TokenType] = {
+            '(': TokenType.LEFT_PAREN,
+            ')': TokenType.RIGHT_PAREN,
+            '{': TokenType.LEFT_BRACE,
+            '}': TokenType.RIGHT_BRACE,
+            '*': TokenType.STAR,
+            '.': TokenType.DOT,
+            ',': TokenType.COMMA,
+            '+': TokenType.PLUS,
+            '-': TokenType.MINUS,
+            ';': TokenType.SEMICOLON,
+            '/': TokenType.SLASH,
+            '=': TokenType.EQUAL,
+            '!': TokenType.BANG,
+            "!=": TokenType.BANG_EQUAL,
+            "==": TokenType.EQUAL_EQUAL,
+            "<=": TokenType.LESS_EQUAL,
+            ">=": TokenType.GREATER_EQUAL,
+            "<": TokenType.LESS,
+            ">": TokenType.GREATER,
+            "and":    TokenType.AND,
+            "class":  TokenType.CLASS,
+            "else":   TokenType.ELSE,
+            "false":  TokenType.FALSE,
+            "for":    TokenType.FOR,
+            "fun":    TokenType.FUN,
+            "if":     TokenType.IF,
+            "nil":    TokenType.NIL,
+            "or":     TokenType.OR,
+            "print":  TokenType.PRINT,
+            "return": TokenType.RETURN,
+            "super":  TokenType.SUPER,
+            "this":   TokenType.THIS,
+            "true":   TokenType.TRUE,
+            "var":    TokenType.VAR,
+            "while":  TokenType.WHILE
         }
         self.ret: int = 0
 
     def scan(self) -> None:
         self.line_number += 1
-        char = 0
-        while char < len(self.content):
-            type: str = ''
-            literal: Any = None
-            err: Err = Err.NONE
-            token_str: str = self.content[char]
-            if token_str == '\n':
-                char += 1
-                self.line_number += 1
-                continue
-            if token_str.isspace():
-                char += 1
-                continue
-            # handle operators
-            if token_str == '=' and char + 1 < len(self.content):
-                if self.content[char + 1] == '=':
-                    char += 1
-                    token_str += self.content[char]
-            elif token_str == '!' and char + 1 < len(self.content):
-                if self.content[char + 1] == '=':
-                    char += 1
-                    token_str += self.content[char]
-            elif (token_str == '>' or token_str == '<') and char + 1 < len(self.content):
-                if self.content[char + 1] == '=':
-                    char += 1
-                    token_str += self.content[char]
-            # handle comments
-            elif token_str == '/' and char + 1 < len(self.content) and self.content[char + 1] == '/':
+        pos = 0
+        end = len(self.content)
+        while pos < end:
+            token, pos = self.scan_token(pos)
+            if token:
+                self.add_token(token)
 
-                # // comment -> skip the rest of line
-                if (i := self.content[char + 1:].find('\n')) >= 0:
-                    char += i + 1
-                    continue
-                else:  # the file itself is a comment
-                    break
-
-            elif token_str == '"':
-                if (ret := self.scan_string_literals(self.content[char+1:])):
-                    type, literal = ret
-                    token_str = f'"{literal}"'
-                    char += len(literal) + 1
-                else:
-                    self.ret = 65
-                    err = Err.UNTERMINATED_STRING
-                    char = len(self.content)
-            elif token_str.isdigit():
-                type, token_str = self.scan_nums(self.content[char:])
-                literal = float(token_str)
-                char += len(token_str) - 1
-            elif self.is_id_start(token_str):
-                type, token_str = self.scan_id_keywords(self.content[char:])
-                char += len(token_str) - 1
-            elif token_str not in self.lexmes:
-                self.ret = 65
-                err = Err.UNEXPECTED_CHAR
+        self.add_token(Token(TokenType.EOF, '', 'null', self.line_number + 1))
 
-            self.add_token(self.tokenize(
-                token_str, self.line_number, type=type, literal=literal, err=err))
-            char += 1
+    def scan_stream(self, file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Token]:
+        # yields tokens lazily while reading file chunk by chunk, only the unscanned
+        # tail of the current chunk is kept in self.content
+        self.line_number += 1
+        self.content = file.read(chunk_size)
+        pos = 0
+        eof = not self.content
+        while not eof or pos < len(self.content):
+            line_number, ret = self.line_number, self.ret
+            token, end = self.scan_token(pos)
+            if end >= len(self.content) and not eof:
+                # the token may continue in the next chunk -> rescan it with more input
+                self.line_number, self.ret = line_number, ret
+                rest = self.content[pos:]
+                chunk = file.read(max(chunk_size, len(rest)))
+                eof = not chunk
+                self.content = rest + chunk
+                pos = 0
+                continue
+            pos = end
+            if token:
+                yield token
 
-        self.add_token(Token('EOF', '', 'null', self.line_number + 1))
+        yield Token(TokenType.EOF, '', 'null', self.line_number + 1)
 
-    def scan_string_literals(self, line: str) -> tuple[str, str] | None:
-        end = -1
-        for i, c in enumerate(line):
+    def scan_token(self, pos: int) -> tuple[Token | None, int]:
+        # skips whitespace and comments starting at offset pos then scans one token,
+        # returns the token (None if nothing is left) and the offset right after it
+        content = self.content
+        end = len(content)
+        while pos < end:
+            c = content[pos]
             if c == '\n':
                 self.line_number += 1
-            elif c == '"':
-                end = i
+                pos += 1
+            elif c.isspace():
+                pos += 1
+            elif c == '/' and pos + 1 < end and content[pos + 1] == '/':
+                # // comment -> skip the rest of line
+                if (pos := content.find('\n', pos + 2)) < 0:
+                    # the file itself is a comment
+                    return None, end
+            else:
                 break
+        else:
+            return None, pos
+
+        type: TokenType | None = None
+        literal: Any = None
+        err: Err = Err.NONE
+        token_str: str = c
+        # handle operators
+        if c in '=!<>':
+            if pos + 1 < end and content[pos + 1] == '=':
+                token_str = content[pos:pos + 2]
+            pos += len(token_str)
+        elif c == '"':
+            if (ret := self.scan_string_literals(content, pos + 1)):
+                type, literal = ret
+                token_str = content[pos:pos + len(literal) + 2]
+                pos += len(token_str)
+            else:
+                self.ret = 65
+                err = Err.UNTERMINATED_STRING
+                pos = end
+        elif c.isdigit():
+            type, token_str = self.scan_nums(content, pos)
+            literal = float(token_str)
+            pos += len(token_str)
+        elif self.is_id_start(c):
+            type, token_str = self.scan_id_keywords(content, pos)
+            pos += len(token_str)
+        else:
+            if c not in self.lexmes:
+                self.ret = 65
+                err = Err.UNEXPECTED_CHAR
+            pos += 1
+
+        return self.tokenize(token_str, self.line_number, type=type, literal=literal, err=err), pos
+
+    def scan_string_literals(self, line: str, start: int = 0) -> tuple[TokenType, str] | None:
+        end = line.find('"', start)
         if end != -1:
-            return ('STRING', line[:end])
+            self.line_number += line.count('\n', start, end)
+            return (TokenType.STRING, line[start:end])
         else:
+            self.line_number += line.count('\n', start)
             return None
 
     def is_id_start(self, c: str) -> bool:
@@ -162,36 +232,35 @@ class Scanner:
             return True
         return False
 
-    def scan_id_keywords(self, line: str) -> tuple[str, str]:
-        end = 1
-        type: str = 'IDENTIFIER'
-        for c in line[1:]:
-            if self.is_valid_id_char(c):
+    def scan_id_keywords(self, line: str, start: int = 0) -> tuple[TokenType, str]:
+        end = start + 1
+        while end < len(line):
+            c = line[end]
+            if c.isalpha() or c == '_' or c.isdigit():
                 end += 1
             else:
                 break
-        if line[0:end] in self.lexmes:
-            type = self.lexmes[line[0:end]]
-        return type, line[0:end]
+        lexme = line[start:end]
+        return self.lexmes.get(lexme, TokenType.IDENTIFIER), lexme
 
-    def scan_nums(self, line: str) -> tuple[str, str]:
-        i = 1
-        num: str = line[0]
+    def scan_nums(self, line: str, start: int = 0) -> tuple[TokenType, str]:
+        end = start + 1
         first_dot = True
-        while i < len(line):
-            if line[i].isdigit() or (line[i] == '.' and first_dot):
-                if line[i] == '.':
-                    first_dot = False
-                num += line[i]
+        while end < len(line):
+            c = line[end]
+            if c.isdigit():
+                end += 1
+            elif c == '.' and first_dot:
+                first_dot = False
+                end += 1
             else:
                 break
-            i += 1
-        return 'NUMBER', num
+        return TokenType.NUMBER, line[start:end]
 
-    def tokenize(self, lexme: str, line: int, type: str = '', literal: Any = None, err: Err = Err.NONE) -> Token:
+    def tokenize(self, lexme: str, line: int, type: TokenType | None = None, literal: Any = None, err: Err = Err.NONE) -> Token:
         literal = literal if literal != None else 'null'
-        if not type and lexme in self.lexmes:
-            type = self.lexmes[lexme]
+        if type is None:
+            type = self.lexmes.get(lexme, TokenType.ERROR)
         return Token(type, lexme, literal, line, err=err)
 
     def add_token(self, token: Token) -> None:
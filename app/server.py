@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from app.batch import Command, capture
+
+# protocol: one JSON object per line each way on a unix socket, a request
+#   {"id": 1, "command": "run", "source": "print 1;", "options": {"engine": "vm"}}
+# is answered with
+#   {"id": 1, "code": 0, "stdout": "1\n", "stderr": ""}
+# requests on a connection are answered in order, clients wanting more than
+# one in flight open more connections
+
+COMMANDS = ('tokenize', 'parse', 'evaluate', 'run')
+# the options a request may set, the rest are the server's
+REQUEST_OPTIONS = ('engine', 'scanner', 'optimize', 'infer', 'stream')
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_STEPS = 10000000
+DEFAULT_MAX_STRING = 1 << 24
+# the longest request line read, a source of up to max-string characters
+# with room for its JSON escapes; a longer one is answered with an error
+MAX_REQUEST = 1 << 26
+
+
+class Server:
+    # runs requests in a pool of worker processes, at most one per worker at a
+    # time; each gets a fresh interpreter, a timeout and run limits
+    # (--timeout=seconds, --max-steps=N, --max-string=chars, --jobs=N workers,
+    # one per CPU); the interpreter's time limit is the timeout
+    def __init__(self, path: str, options: dict[str, str], execute: Command) -> None:
+        self.path = path
+        self.execute = execute
+        self.jobs = int(options.get('jobs') or 0) or os.cpu_count() or 1
+        self.timeout = float(options.get('timeout') or DEFAULT_TIMEOUT)
+        # the server's engine is a default a request may change, its limits are not
+        self.defaults = {'engine': options['engine']} if 'engine' in options else {}
+        self.limits = {'max-steps': options.get('max-steps') or str(DEFAULT_MAX_STEPS),
+                       'max-string': options.get('max-string') or str(DEFAULT_MAX_STRING),
+                       'max-time': str(self.timeout)}
+
+    async def serve(self) -> None:
+        server = await self.start()
+        # ctrl-c and SIGTERM stop accepting and remove the socket
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, server.close)
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.close()
+
+    async def start(self) -> asyncio.Server:
+        self.pool = ProcessPoolExecutor(self.jobs)
+        self.slots = asyncio.Semaphore(self.jobs)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        return await asyncio.start_unix_server(self.handle, self.path, limit=MAX_REQUEST)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # over the limit, the line is dropped and the next one read
+                    response = {'code': 1, 'stdout': '',
+                                'stderr': f'Bad request: longer than {MAX_REQUEST} bytes\n'}
+                else:
+                    if not line:
+                        break
+                    response = await self.respond(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+            command = request['command']
+            source = request['source']
+            if command not in COMMANDS or not isinstance(source, str):
+                raise ValueError(command)
+            options = {name: str(value) for name, value in request.get('options', {}).items()
+                       if name in REQUEST_OPTIONS}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {'code': 1, 'stdout': '', 'stderr': f'Bad request: {e}\n'}
+        response: dict[str, Any] = {'id': request['id']} if 'id' in request else {}
+        await self.slots.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            job = loop.run_in_executor(self.pool, capture, self.execute, command, '<request>',
+                                       {**self.defaults, **options, **self.limits}, source)
+        except BaseException:
+            self.slots.release()
+            raise
+        # the slot is the worker's until the job is done, a request that timed
+        # out does not let another one queue behind a worker still busy with it
+        job.add_done_callback(self.release)
+        try:
+            response.update(await asyncio.wait_for(asyncio.shield(job), self.timeout))
+        except TimeoutError:
+            # the time limit is checked between statements once the run has
+            # started, a request still scanning or parsing, or running one
+            # long statement, is answered here; the worker goes on until done
+            response.update(code=75, stdout='',
+                            stderr=f'Request timed out after {self.timeout:g}s.\n')
+        return response
+
+    def release(self, job: asyncio.Future) -> None:
+        if not job.cancelled():
+            # retrieved, or asyncio logs the error of a job nobody waited for
+            job.exception()
+        self.slots.release()
@@ -0,0 +1,59 @@
+from typing import Any, Iterable
+from app.AST import *
+from app.env import UNDEFINED
+from app.evaluator import NUMBER_OPS, UNARY_OPS, Evaluator
+from app.interpreter import Interpreter
+from app.output import Output
+from app.limits import Limits
+
+
+class StackEvaluator(Evaluator):
+    # evaluates the post order of an expression against a value stack instead
+    # of recursing, so nesting depth is bounded by memory, not the python stack
+
+    def evaluate(self, expression: Expr) -> Any:
+        env = self.env
+        values = env.values
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        binary_ops = self.binary_ops
+        concat = self.concat
+        for node in postorder(expression):
+            kind = type(node)
+            if kind is Literal:
+                push(node.value)
+            elif kind is Binary:
+                right = pop()
+                if node.operands is Type.NUMBER:
+                    stack[-1] = NUMBER_OPS[node.op](stack[-1], right)
+                elif node.operands:
+                    stack[-1] = concat(stack[-1], right)
+                else:
+                    stack[-1] = binary_ops[node.op](stack[-1], right)
+            elif kind is Variable:
+                if node.slot < 0:
+                    push(env.get(node.name))
+                else:
+                    value = values[node.slot]
+                    push(env.get_at(node.slot) if value is UNDEFINED else value)
+            elif kind is Unary:
+                if node.operands:
+                    stack[-1] = -stack[-1]
+                else:
+                    stack[-1] = UNARY_OPS[node.op](stack[-1])
+            elif kind is Assign:
+                if node.slot < 0:
+                    env.put(node.name, stack[-1])
+                else:
+                    values[node.slot] = stack[-1]
+            # a Grouping leaves its operand's value as its own
+        return stack[-1]
+
+
+class StackInterpreter(Interpreter):
+    # the tree walking Interpreter with expressions evaluated by StackEvaluator
+
+    def __init__(self, stmts: Iterable[Stmt], out: Output | None = None,
+                 limits: Limits | None = None) -> None:
+        super().__init__(stmts, StackEvaluator(), out, limits)
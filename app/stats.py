@@ -0,0 +1,59 @@
+import contextlib
+import time
+import tracemalloc
+from typing import Any, ContextManager, Iterator
+from app.AST import *
+
+# what each phase's throughput is counted in
+THROUGHPUT: dict[str, str] = {'scan': 'tokens', 'parse': 'nodes', 'execute': 'nodes'}
+
+
+def count_nodes(stmts: list[Stmt]) -> int:
+    return sum(1 + (len(postorder(stmt.expr)) if stmt.expr else 0) for stmt in stmts)
+
+
+class Stats:
+    # wall time and peak traced memory of each pipeline phase a command goes
+    # through, with the number of tokens and AST nodes it handled. when not
+    # enabled phase and count do nothing, so commands can always use them.
+    # tracemalloc slows the traced code down several times, without memory
+    # the times are those of an untraced run
+    def __init__(self, enabled: bool = True, memory: bool = True) -> None:
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.phases: dict[str, dict[str, float]] = {}
+        self.counts: dict[str, int] = {}
+        if self.memory:
+            tracemalloc.start()
+        self.start = time.perf_counter()
+
+    def phase(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self.timed(name)
+
+    @contextlib.contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        if self.memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = {'seconds': time.perf_counter() - start}
+            if self.memory:
+                self.phases[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+
+    def count(self, name: str, n: int) -> None:
+        if self.enabled:
+            self.counts[name] = n
+
+    def json(self, command: str) -> dict[str, Any]:
+        phases: dict[str, dict[str, float]] = {}
+        for name, phase in self.phases.items():
+            phases[name] = dict(phase)
+            unit = THROUGHPUT.get(name)
+            if unit in self.counts and phase['seconds'] > 0:
+                phases[name][f'{unit}_per_second'] = self.counts[unit] / phase['seconds']
+        return {'command': command, 'seconds': time.perf_counter() - self.start,
+                'phases': phases, **self.counts}
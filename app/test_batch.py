@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app.batch import batch, scripts
+from app.main import execute
+from app.output import Output
+
+SCRIPTS = {
+    'a.lox': 'print 1; print "a" - 1;',
+    'b.lox': 'print 2',
+    'sub/c.lox': 'var x = 3; print x;',
+}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        for name, source in SCRIPTS.items():
+            path = os.path.join(self.dir.name, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(source)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def run_batch(self, target: str, jobs: int, options: dict[str, str] | None = None) -> list[dict]:
+        stream = io.StringIO()
+        out = Output(stream)
+        batch(target, options or {}, out, execute, jobs)
+        out.flush()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_directory(self) -> None:
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                results = self.run_batch(self.dir.name, jobs)
+                self.assertEqual([(os.path.relpath(r['file'], self.dir.name), r['code'], r['stdout'], r['stderr'])
+                                  for r in results],
+                                 [('a.lox', 70, '1\n', 'Operands must be numbers.\n'),
+                                  ('b.lox', 65, '', 'Statment missing ;\n'),
+                                  (os.path.join('sub', 'c.lox'), 0, '3\n', '')])
+
+    def test_scan_jobs(self) -> None:
+        # a worker cannot start a pool of its own, it scans the chunks alone
+        path = os.path.join(self.dir.name, 'sub', 'long.lox')
+        with open(path, 'w') as file:
+            file.write('print 1;\n' * 1000)
+        with mock.patch('app.parallel.CHUNK_MIN', 1000):
+            results = self.run_batch(os.path.join(self.dir.name, 'sub'), 2, {'scan-jobs': '2'})
+        self.assertEqual([(r['code'], r['stderr']) for r in results], [(0, ''), (0, '')])
+        self.assertEqual(results[1]['stdout'], '1\n' * 1000)
+
+    def test_manifest(self) -> None:
+        manifest = os.path.join(self.dir.name, 'scripts.txt')
+        with open(manifest, 'w') as file:
+            file.write('sub/c.lox\n\nmissing.lox\n')
+        self.assertEqual(len(scripts(manifest)), 2)
+        results = self.run_batch(manifest, 1)
+        self.assertEqual([r['code'] for r in results], [0, 1])
+        assert (results[1]['stderr'].startswith('[Errno 2]'))
+
+
+if __name__ == '__main__':
+    unittest.main()
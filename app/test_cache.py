@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.cache import ASTCache, dump_ast, load_ast
+from app.AST import *
+
+
+def parse(source: str) -> list[Stmt]:
+    s = Scanner(source)
+    s.scan()
+    return Parser(s.tokens).parse()
+
+
+class TestCache(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        stmts = parse('var a; var b = "s"; a = b = -(1 + 2) * 3; print !a == nil; print true;')
+        self.assertEqual(load_ast(dump_ast(stmts, 3)), (stmts, 3))
+
+    def test_key(self) -> None:
+        cache = ASTCache('unused')
+        self.assertEqual(cache.key('print 1;'), cache.key('print 1;'))
+        self.assertNotEqual(cache.key('print 1;'), cache.key('print 2;'))
+        self.assertNotEqual(cache.key('print 1;'), cache.key('print 1;', True))
+
+    def test_store_load_evict(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ASTCache(directory)
+            stmts = parse('print 1 + 2;')
+            self.assertIsNone(cache.load(cache.key('print 1 + 2;')))
+            cache.store(cache.key('print 1 + 2;'), stmts)
+            self.assertEqual(cache.load(cache.key('print 1 + 2;')), (stmts, 0))
+
+            size = os.path.getsize(cache.path(cache.key('print 1 + 2;')))
+            cache.max_size = size * 2
+            os.utime(cache.path(cache.key('print 1 + 2;')), (0, 0))
+            for source in ('print 3 + 4;', 'print 5 + 6;'):
+                cache.store(cache.key(source), parse(source))
+            # the oldest entry went first
+            self.assertIsNone(cache.load(cache.key('print 1 + 2;')))
+            self.assertIsNotNone(cache.load(cache.key('print 5 + 6;')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import contextlib
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.vm import VM
+from app.closures import ClosureInterpreter
+from app.stackeval import StackInterpreter
+from app.transpiler import PythonInterpreter
+
+ENGINES: list[type[Interpreter]] = [Interpreter, VM, ClosureInterpreter, StackInterpreter,
+                                    PythonInterpreter]
+
+SCRIPTS = [
+    'print (1 + 2) * (5 - 3) / 4;',
+    'print "a" + "b" == "ab"; print !!12; print !nil; print -(-2.5);',
+    'var a; var c; a = c = 4; print a; print c + 3; print a >= c != false;',
+    'var s = "x"; s = s + "y"; print s; print nil == nil; print 1 == true;',
+    'print 1; print "a" - 1; print 2;',
+    'print 1; print 1 + "a";',
+    'print -"x";',
+    'print 3 < nil;',
+    'print y;',
+    'x = 1; print x;',
+    'var a = 1; var b = a + 1; var a = b * 2; print a; print c; var c = 1;',
+]
+
+
+def run(engine: type[Interpreter], source: str) -> tuple[str, str]:
+    s = Scanner(source)
+    s.scan()
+    out = io.StringIO()
+    error = ''
+    with contextlib.redirect_stdout(out):
+        try:
+            engine(Parser(s.tokens).parse()).interpret()
+        except RuntimeError as e:
+            error = str(e)
+    return out.getvalue(), error
+
+
+class TestEngines(unittest.TestCase):
+    def test_same_output(self) -> None:
+        for source in SCRIPTS:
+            expected = run(Interpreter, source)
+            for engine in ENGINES:
+                with self.subTest(engine=engine.__name__, source=source):
+                    self.assertEqual(run(engine, source), expected)
+
+    def test_runtime_error(self) -> None:
+        for engine in ENGINES:
+            out, error = run(engine, 'print 1; print "a" - 1; print 2;')
+            self.assertEqual((out, error), ('1\n', 'Operands must be numbers.'))
+
+    def test_stream(self) -> None:
+        # streamed statements run as they are parsed, before a syntax error after
+        # them. python compiles the whole program into one function
+        for engine in ENGINES:
+            if engine is PythonInterpreter:
+                continue
+            with self.subTest(engine=engine.__name__):
+                source = io.StringIO('var a = "x"; print a + "1"; print 2; print ;')
+                tokens = Scanner('').scan_stream(source, 4)
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out), self.assertRaises(SyntaxError):
+                    engine(Parser(tokens).declarations()).interpret()
+                self.assertEqual(out.getvalue(), 'x1\n2\n')
+
+    def test_stack_depth(self) -> None:
+        depth = 20000
+        source = ('var a = ' + '(' * depth + '1' + ')' * depth + ';'
+                  + 'print a' + ' + a' * depth + ';' + 'print ' + '-' * depth + 'a;')
+        self.assertEqual(run(StackInterpreter, source), ('20001\n1\n', ''))
+        out, error = run(StackInterpreter, 'print ' + '(' * depth + '1 + nil' + ')' * depth + ';')
+        self.assertEqual((out, error), ('', 'Operands must be two numbers or two strings.'))
+
+    def test_resolved_slots(self) -> None:
+        s = Scanner('var a = 1; b = a; print b + a;')
+        s.scan()
+        stmts = Parser(s.tokens).parse()
+        interpreter = Interpreter(stmts)
+        for stmt in stmts:
+            interpreter.resolver.resolve(stmt)
+        self.assertEqual(stmts[0].slot, 0)
+        self.assertEqual(stmts[1].expr.slot, 1)
+        self.assertEqual(stmts[1].expr.expr.slot, 0)
+        self.assertEqual(interpreter.evaluator.env.names, ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import random
+import unittest
+from app.AST import postorder
+from app.scanner import Scanner
+from app.regexscanner import RegexScanner
+from app.RDParser import Parser
+from app.incremental import Document, Offsets
+
+PIECES = ['print 1;', 'var a = 2;', 'a = a + 1;', '"str\ning"', '// c\n', '\n', ' ', ';', '(', ')', '+',
+          'x', '1.5', '"', '!', '==', 'var', '-', '@', 'nil', '\r\n']
+
+
+def tokens(tokens: list) -> list[tuple]:
+    return [(str(t), t.line, t.err) for t in tokens]
+
+
+def lines(stmts: list) -> list[int]:
+    # the line of every statement and node, equality leaves them out
+    result = []
+    for stmt in stmts:
+        result.append(stmt.line)
+        if stmt.expr is not None:
+            result.extend(node.line for node in postorder(stmt.expr))
+    return result
+
+
+class TestIncremental(unittest.TestCase):
+    def assertScanned(self, doc: Document, cls: type[Scanner] = Scanner) -> None:
+        # the same as scanning and parsing the whole text
+        s = cls(doc.text)
+        s.scan()
+        self.assertEqual(tokens(doc.tokens), tokens(s.tokens), doc.text)
+        self.assertEqual(doc.ret, s.ret)
+        stmts = []
+        error = None
+        try:
+            for stmt in Parser(iter(s.tokens)).declarations():
+                stmts.append(stmt)
+        except SyntaxError as e:
+            error = str(e)
+        self.assertEqual(doc.stmts, stmts, doc.text)
+        self.assertEqual(lines(doc.stmts), lines(stmts))
+        self.assertEqual(None if doc.error is None else str(doc.error), error, doc.text)
+
+    def test_offsets(self) -> None:
+        offsets = Offsets([2, 5, 9, 14], 20)
+        offsets.replace(1, 2, [4, 6, 7], 22)
+        self.assertEqual([offsets[i] for i in range(len(offsets))], [2, 4, 6, 7, 11, 16])
+        offsets.move(0)
+        offsets.replace(5, 6, [], 22)
+        self.assertEqual([offsets[i] for i in range(len(offsets))], [2, 4, 6, 7, 11])
+        self.assertEqual([offsets.bisect(n) for n in (0, 4, 5, 11, 12)], [0, 1, 2, 4, 5])
+
+    def test_random_edits(self) -> None:
+        rnd = random.Random(1)
+        for trial in range(60):
+            cls = (Scanner, RegexScanner)[trial % 2]
+            doc = Document(''.join(rnd.choice(PIECES) for _ in range(rnd.randrange(60))), cls)
+            self.assertScanned(doc, cls)
+            for _ in range(20):
+                offset = rnd.randint(0, len(doc.text))
+                deleted = rnd.randint(0, min(6, len(doc.text) - offset))
+                doc.edit(offset, deleted, ''.join(rnd.choice(PIECES) for _ in range(rnd.randrange(3))))
+                self.assertScanned(doc, cls)
+
+    def test_reuse(self) -> None:
+        source = ''.join(f'var v{i} = {i};\n' for i in range(100))
+        doc = Document(source)
+        before, stmts = list(doc.tokens), doc.stmts
+        # a new line in the middle, then a statement typed on it a character at a time
+        offset = source.index('var v50')
+        doc.edit(offset, 0, '\n')
+        for i, char in enumerate('print v1 + 2;'):
+            doc.edit(offset + i, 0, char)
+        self.assertScanned(doc)
+        # the var the new line was put before is scanned and parsed again, the
+        # ones after it are moved down a line
+        self.assertTrue(all(a is b for a, b in zip(doc.stmts[:50], stmts[:50])))
+        self.assertTrue(all(a is b for a, b in zip(doc.stmts[52:], stmts[51:])))
+        self.assertTrue(all(a is b for a, b in zip(doc.tokens[-246:], before[-246:])))
+        self.assertEqual([stmt.line for stmt in doc.stmts[50:53]], [51, 52, 53])
+
+    def test_errors(self) -> None:
+        doc = Document('print 1;\nprint -;\nprint 3;\nvar = 4;\n')
+        self.assertEqual(str(doc.error), "[line 2] Error at ';': Expect expression.")
+        self.assertEqual(len(doc.stmts), 1)
+        # the message follows the lines, the declarations after a failed one are kept
+        third = doc.segments[2]
+        doc.edit(0, 0, '\n\n')
+        self.assertEqual(str(doc.error), "[line 4] Error at ';': Expect expression.")
+        doc.edit(doc.text.index('-') + 1, 0, '2')
+        self.assertIs(doc.segments[2], third)
+        self.assertEqual(str(doc.error), '[line 6]: Expected Identifier after var')
+        self.assertScanned(doc)
+        doc.edit(doc.text.index('var'), 9, '"open')
+        self.assertEqual(doc.ret, 65)
+        self.assertScanned(doc)
+        with self.assertRaises(ValueError):
+            doc.edit(len(doc.text), 1, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
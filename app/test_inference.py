@@ -0,0 +1,94 @@
+import contextlib
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.inference import TypeInference
+from app.interpreter import Interpreter
+from app.limits import Limits, LimitError
+from app.cache import dump_ast, load_ast
+from app.rope import ROPE_MIN
+from app.test_engines import ENGINES, SCRIPTS
+from app.AST import *
+
+# appended by the scripts below, long enough to reach ROPE_MIN in few statements
+PIECE = 'abcdefgh' * 16
+
+
+def infer(source: str) -> tuple[list[Stmt], TypeInference]:
+    s = Scanner(source)
+    s.scan()
+    inference = TypeInference()
+    return list(inference.infer(Parser(s.tokens).parse())), inference
+
+
+def run(engine: type[Interpreter], source: str, limits: Limits | None = None) -> tuple[str, str]:
+    stmts, _ = infer(source)
+    out = io.StringIO()
+    error = ''
+    with contextlib.redirect_stdout(out):
+        try:
+            engine(stmts, limits=limits).interpret()
+        except (RuntimeError, LimitError) as e:
+            error = str(e)
+    return out.getvalue(), error
+
+
+class TestInference(unittest.TestCase):
+    def test_marks(self) -> None:
+        stmts, inference = infer('var a = 1; var s = "x"; print a * 2 + a; print s + s;'
+                                 ' print s + a; print -a; a = s; print a + 1;')
+        product = stmts[2].expr
+        self.assertEqual((product.operands, product.lexpr.operands), (Type.NUMBER, Type.NUMBER))
+        self.assertEqual(stmts[3].expr.operands, Type.STRING)
+        self.assertEqual(stmts[4].expr.operands, Type.UNKNOWN)
+        self.assertEqual(stmts[5].expr.operands, Type.NUMBER)
+        # a holds a string from the assignment on
+        self.assertEqual(stmts[7].expr.operands, Type.UNKNOWN)
+        self.assertEqual((inference.specialized, inference.operations), (4, 6))
+
+    def test_unknown(self) -> None:
+        # comparisons give booleans, failed operations and unset variables nothing
+        stmts, inference = infer('var b = 1 < 2; var n; print b + b; print n - 1;'
+                                 ' print (1 - "x") * 2; print c / 2; var c = 2;'
+                                 ' print (c = "y") + c;')
+        self.assertEqual([stmt.expr.operands for stmt in stmts[2:6]], [Type.UNKNOWN] * 4)
+        self.assertEqual(stmts[7].expr.operands, Type.STRING)
+        self.assertEqual((inference.specialized, inference.operations), (2, 7))
+
+    def test_same_output(self) -> None:
+        scripts = SCRIPTS + [
+            'var a = 2; var b = a * a - 1; print b / a; print a <= b; print -b;',
+            'var s = "a"; var t = s + "b"; print t + s; t = 1; print t + 1;',
+            'var a = 1; print a + (a = 2); print (a = "x") + a; print a + 1;',
+        ]
+        for source in scripts:
+            expected = run(Interpreter, source)
+            for engine in ENGINES:
+                with self.subTest(engine=engine.__name__, source=source):
+                    self.assertEqual(run(engine, source), expected)
+
+    def test_string_limit(self) -> None:
+        # a specialized + still checks the string limit
+        source = 'var s = "";' + f' s = s + "{PIECE}";' * (ROPE_MIN // 32)
+        limits = Limits(max_string=ROPE_MIN * 3)
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(run(engine, source, limits),
+                                 ('', f'String limit of {ROPE_MIN * 3} characters exceeded.'))
+        # two ropes added to each other
+        source = f'var a = "{"x" * (ROPE_MIN + 76)}"; var b = a + a; var c = b + b; print "ok";'
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__, ropes=True):
+                self.assertEqual(run(engine, source, limits),
+                                 ('', f'String limit of {ROPE_MIN * 3} characters exceeded.'))
+
+    def test_cache(self) -> None:
+        stmts, _ = infer('var a = 1; print -a + a;')
+        loaded, _ = load_ast(dump_ast(stmts))
+        self.assertEqual(loaded[1].expr.operands, Type.NUMBER)
+        self.assertEqual(loaded[1].expr.lexpr.operands, Type.NUMBER)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.output import Output
+from app.limits import Limits, LimitError
+from app.test_engines import ENGINES
+
+
+def run(engine: type, source: str, limits: Limits) -> tuple[str, str]:
+    s = Scanner(source)
+    s.scan()
+    stream = io.StringIO()
+    error = ''
+    try:
+        engine(Parser(s.tokens).parse(), out=Output(stream), limits=limits).interpret()
+    except LimitError as e:
+        error = str(e)
+    return stream.getvalue(), error
+
+
+class TestLimits(unittest.TestCase):
+    def test_steps(self) -> None:
+        # 3 + 7 + 2 steps, the group is a node too
+        source = 'var a = -1; print a + (2 * a); print a;'
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(run(engine, source, Limits(max_steps=12)), ('-3\n-1\n', ''))
+                self.assertEqual(run(engine, source, Limits(max_steps=11)),
+                                 ('-3\n', 'Step limit of 11 exceeded.'))
+
+    def test_string(self) -> None:
+        source = 'var s = "ab"; s = s + s; print s; s = s + "c"; print s;'
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(run(engine, source, Limits(max_string=4)),
+                                 ('abab\n', 'String limit of 4 characters exceeded.'))
+                self.assertEqual(run(engine, 'print 1 + 2;', Limits(max_string=1)), ('3\n', ''))
+
+    def test_time(self) -> None:
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                out, error = run(engine, 'print 1;' * 100, Limits(max_seconds=1e-9, interval=1))
+                self.assertEqual(error, 'Time limit of 1e-09s exceeded.')
+
+
+if __name__ == '__main__':
+    unittest.main()
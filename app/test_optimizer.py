@@ -0,0 +1,55 @@
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.optimizer import Optimizer
+from app.AST import *
+
+
+def optimize(source: str) -> tuple[list[Stmt], int]:
+    s = Scanner(source)
+    s.scan()
+    optimizer = Optimizer()
+    stmts = list(optimizer.optimize(Parser(s.tokens).parse()))
+    return stmts, optimizer.removed
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_fold_literals(self) -> None:
+        stmts, removed = optimize('print (1 + 2) * (5 - 3);')
+        self.assertEqual(stmts, [PrintStmt(Literal(6.0))])
+        self.assertEqual(removed, 8)
+
+    def test_fold_strings_and_unary(self) -> None:
+        stmts, _ = optimize('print "a" + "b" == "ab"; print -(-2);')
+        self.assertEqual(stmts, [PrintStmt(Literal(True)),
+                                 PrintStmt(Literal(2.0))])
+
+    def test_keep_errors(self) -> None:
+        stmts, removed = optimize('print ("a" - 1); print 1 / 0;')
+        self.assertEqual(stmts, [PrintStmt(Binary(Literal('a'), Literal(1.0), TokenType.MINUS)),
+                                 PrintStmt(Binary(Literal(1.0), Literal(0.0), TokenType.SLASH))])
+        self.assertEqual(removed, 1)
+
+    def test_variables(self) -> None:
+        stmts, _ = optimize('var a = 2 * 3; a = a + (1 + 1);')
+        self.assertEqual(stmts, [Decl('a', Literal(6.0)),
+                                 ExprStmt(Assign('a', Binary(Variable('a'), Literal(2.0), TokenType.PLUS)))])
+
+    def test_double_negation(self) -> None:
+        stmts, removed = optimize('print !!!(!!a);')
+        self.assertEqual(stmts, [PrintStmt(Unary(TokenType.BANG, Variable('a')))])
+        self.assertEqual(removed, 5)
+
+    def test_deep(self) -> None:
+        # nested past the recursion limit, as the parser and the stack engine allow
+        depth = 3000
+        stmts, removed = optimize('print ' + '(' * depth + '1' + ' + 1)' * depth + ';')
+        self.assertEqual(stmts, [PrintStmt(Literal(depth + 1.0))])
+        self.assertEqual(removed, depth * 3)
+        stmts, removed = optimize('print ' + '(' * depth + 'a' + ' + 1)' * depth + ';')
+        self.assertEqual(removed, depth)
+        self.assertEqual(stmts[0].expr.rexpr, Literal(1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.output import Output
+
+
+class TestOutput(unittest.TestCase):
+    def test_threshold(self) -> None:
+        stream = io.StringIO()
+        out = Output(stream, threshold=4)
+        out.line('a')
+        assert (stream.getvalue() == '')
+        out.line('bc')
+        assert (stream.getvalue() == 'a\nbc\n')
+        out.line('d')
+        out.flush()
+        assert (stream.getvalue() == 'a\nbc\nd\n')
+
+    def test_error_order(self) -> None:
+        stream = io.StringIO()
+        out = Output(stream, stream)
+        s = Scanner('print 1; print 2; print -"x"; print 3;')
+        s.scan()
+        try:
+            Interpreter(Parser(s.tokens).parse(), out=out).interpret()
+        except RuntimeError as e:
+            out.error(e)
+        assert (stream.getvalue() == '1\n2\nOperand must be a number.\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
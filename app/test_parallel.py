@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+from app.scanner import Scanner
+from app.regexscanner import RegexScanner
+from app.parallel import boundaries, scan_parallel
+
+
+def tokens(s: Scanner) -> list[tuple]:
+    return [(str(t), t.line, t.err) for t in s.tokens]
+
+
+class TestParallel(unittest.TestCase):
+    def test_boundaries(self) -> None:
+        # never inside a string or comment, // "x and "a // b" included
+        content = 'var a = "x\ny\nz";\n// "\nprint a; // b\n"a // b\n";\nprint "\n'
+        offsets = boundaries(content, 8)
+        self.assertEqual([content[start:end] for start, end in zip(offsets, offsets[1:])],
+                         ['var a = "x\ny\nz";\n', '// "\n', 'print a; // b\n', '"a // b\n";\n',
+                          'print "\n'])
+        self.assertEqual(boundaries(content, 1), [0, len(content)])
+        # an unterminated string runs to the end, there is no newline after it
+        source = 'print "a\nb\nc\nd;\n'
+        self.assertEqual(boundaries(source, 4), [0, len(source)])
+
+    def test_same_tokens(self) -> None:
+        content = ''.join(f'var v{i} = "s\n{i}"; // "{i}\nprint v{i} / {i}.5;\n@' for i in range(300))
+        for cls, source in ((Scanner, content), (RegexScanner, content + 'print "open\n')):
+            with self.subTest(scanner=cls.__name__):
+                s = cls(source)
+                s.scan()
+                parallel = cls(source)
+                with mock.patch('app.parallel.CHUNK_MIN', 1000):
+                    scan_parallel(parallel, 3)
+                self.assertEqual(tokens(parallel), tokens(s))
+                self.assertEqual((parallel.ret, parallel.line_number), (s.ret, s.line_number))
+
+    def test_small(self) -> None:
+        # one chunk is scanned without workers
+        s = Scanner('print 1;\nprint 2;\n')
+        with mock.patch('multiprocessing.Pool') as pool:
+            scan_parallel(s, 4)
+        pool.assert_not_called()
+        self.assertEqual(len(s.tokens), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,35 +1,74 @@
 # test_my_math.py
 import unittest
-from RDParser import *
-from main import Token
-from AST import *
+import io
+import re
+from app.RDParser import *
+from app.scanner import Scanner, Token, TokenType
+from app.AST import *
 
 
 class TestParser(unittest.TestCase):
     def test_number(self) -> None:
         p = Parser(
-            [Token('NUMBER', '12', '12.0', 1), Token('EOF', '', 'null', 1)])
-        ret = print_ast(p.parse())
+            [Token(TokenType.NUMBER, '12', '12.0', 1), Token(TokenType.EOF, '', 'null', 1)])
+        ret = print_ast(p.parse_expr())
         assert (ret == '12.0')
 
     def test_bool(self) -> None:
         p = Parser(
-            [Token('TRUE', 'true', 'null', 1), Token('EOF', '', 'null', 1)])
-        ret = print_ast(p.parse())
+            [Token(TokenType.TRUE, 'true', 'null', 1), Token(TokenType.EOF, '', 'null', 1)])
+        ret = print_ast(p.parse_expr())
         assert (ret == 'true')
 
     def test_nil(self) -> None:
         p = Parser(
-            [Token('NIL', 'nil', 'null', 1), Token('EOF', '', 'null', 1)])
-        ret = print_ast(p.parse())
+            [Token(TokenType.NIL, 'nil', 'null', 1), Token(TokenType.EOF, '', 'null', 1)])
+        ret = print_ast(p.parse_expr())
         assert (ret == 'nil')
 
     def test_expr(self) -> None:
         p = Parser(
-            [Token('NUMBER', '1', '1.0', 1), Token('PLUS', '+', 'null', 1), Token('NUMBER', '2', '2.0', 1), Token('EOF', '', 'null', 1)])
-        ret = print_ast(p.parse())
+            [Token(TokenType.NUMBER, '1', '1.0', 1), Token(TokenType.PLUS, '+', 'null', 1), Token(TokenType.NUMBER, '2', '2.0', 1), Token(TokenType.EOF, '', 'null', 1)])
+        ret = print_ast(p.parse_expr())
         assert (ret == '(+ 1.0 2.0)')
 
+    def test_stream_declarations(self) -> None:
+        s = Scanner('')
+        tokens = s.scan_stream(io.StringIO('var a = "x\ny";\n// c\nprint a;'), 2)
+        stmts = Parser(tokens).declarations()
+        assert (next(stmts) == Decl('a', Literal('x\ny')))
+        assert (s.line_number == 4)
+        assert (next(stmts) == PrintStmt(Variable('a')))
+        assert (next(stmts, None) is None)
+
+    def tokens(self, source: str) -> list[Token]:
+        s = Scanner(source)
+        s.scan()
+        return s.tokens
+
+    def test_matches_ladder(self) -> None:
+        sources = ['a = b = 1 + 2 * -3 - 4 / (5 - !6) >= 7 == nil;',
+                   'print -(a) * ((b)) != "s" < 1 <= 2 > 3;', 'var x = y = z;',
+                   '(a = 1;', '1 + 2 = 3;', 'a = (1 +);', '(a) = 1;', 'print 1 2;']
+        for source in sources:
+            with self.subTest(source=source):
+                try:
+                    expected = LadderParser(self.tokens(source)).parse()
+                except SyntaxError as e:
+                    with self.assertRaisesRegex(SyntaxError, re.escape(str(e))):
+                        Parser(self.tokens(source)).parse()
+                else:
+                    assert (Parser(self.tokens(source)).parse() == expected)
+
+    def test_deep_nesting(self) -> None:
+        depth = 5000
+        expr = Parser(self.tokens('(' * depth + '-1' + ')' * depth + ' + ' + '!' * depth + 'a')).parse_expr()
+        assert (isinstance(expr, Binary))
+        for _ in range(depth):
+            assert (isinstance(expr.lexpr, Grouping))
+            expr.lexpr = expr.lexpr.expr
+        assert (expr.lexpr == Unary(TokenType.MINUS, Literal(1.0)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.main import execute
+from app.output import Output
+from app.profiler import Profile, ProfilingInterpreter
+
+
+class TestProfiler(unittest.TestCase):
+    def test_counters(self) -> None:
+        s = Scanner('var a = 1;\nprint a + 2 *\n (a);\nprint -a;')
+        s.scan()
+        stream = io.StringIO()
+        profile = Profile()
+        ProfilingInterpreter(Parser(s.tokens).parse(), Output(stream), profile=profile).interpret()
+        assert (stream.getvalue() == '3\n-1\n')
+        counts = {category: {key: calls for key, (calls, _, _) in counters.items()}
+                  for category, counters in profile.counters.items()}
+        assert (counts['node'] == {'Decl': 1, 'PrintStmt': 2, 'Literal': 2, 'Binary': 2,
+                                   'Variable': 3, 'Grouping': 1, 'Unary': 1})
+        assert (counts['op'] == {'+': 1, '*': 1, '-': 1})
+        assert (counts['line'] == {1: 2, 2: 5, 3: 2, 4: 3})
+        for calls, total, own in profile.counters['node'].values():
+            assert (0 <= own <= total)
+        assert (profile.json()['line']['2']['calls'] == 5)
+
+    def test_engine_check(self) -> None:
+        # only run and evaluate use an engine, tokenize and parse ignore --engine
+        for command, code in (('tokenize', 0), ('parse', 0), ('run', 1), ('evaluate', 1)):
+            stderr = io.StringIO()
+            try:
+                execute(command, '<test>', {'profile': '', 'engine': 'vm'},
+                        Output(io.StringIO(), stderr), '1 + 2')
+            except SystemExit as e:
+                self.assertEqual(e.code, code, command)
+            self.assertEqual('--profile needs' in stderr.getvalue(), bool(code))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from app.rope import ROPE_MIN, Rope, concat
+from app.limits import Limits
+from app.test_engines import ENGINES, run
+from app.test_limits import run as run_limited
+
+# appended by the scripts below, long enough to reach ROPE_MIN in few statements
+PIECE = 'abcdefgh' * 16
+
+
+class TestRope(unittest.TestCase):
+    def test_shared_pieces(self) -> None:
+        base = concat('a' * ROPE_MIN, 'b')
+        self.assertIs(type(base), Rope)
+        left = base + 'c'
+        right = base + 'd'
+        # right was built from base after left, it must not see left's piece
+        self.assertEqual(str(right), 'a' * ROPE_MIN + 'bd')
+        self.assertEqual(str(left), 'a' * ROPE_MIN + 'bc')
+        self.assertEqual(str(base + 'e'), 'a' * ROPE_MIN + 'be')
+        self.assertEqual(len(left), ROPE_MIN + 2)
+
+    def test_compare(self) -> None:
+        text = 'x' * ROPE_MIN
+        rope = concat(text, 'y')
+        # both ways round, str's == gives way to Rope's
+        self.assertEqual(rope, text + 'y')
+        self.assertEqual(text + 'y', rope)
+        self.assertEqual(rope, concat(text + 'y', ''))
+        self.assertNotEqual(rope, text)
+        self.assertNotEqual(rope, 1.0)
+        self.assertNotEqual(rope, None)
+        self.assertEqual(str('z' + rope), 'z' + text + 'y')
+
+    def test_engines(self) -> None:
+        # the same output as plain strings, up to and past the rope size
+        source = ('var s = ""; var t = "";' + f' s = s + "{PIECE}";' * (ROPE_MIN // 128)
+                  + ' t = s; s = s + "!"; print t == s; print s == t + "!";'
+                  + ' print "<" + s + ">"; print s + 1;')
+        expected = ('false\ntrue\n<' + PIECE * (ROPE_MIN // 128) + '!>\n',
+                    'Operands must be two numbers or two strings.')
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(run(engine, source), expected)
+
+    def test_string_limit(self) -> None:
+        source = 'var s = "";' + f' s = s + "{PIECE}";' * (ROPE_MIN // 32)
+        limits = Limits(max_string=ROPE_MIN * 3)
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(run_limited(engine, source, limits),
+                                 ('', f'String limit of {ROPE_MIN * 3} characters exceeded.'))
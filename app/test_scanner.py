@@ -1,6 +1,11 @@
 # test_my_math.py
+import io
+import os
+import tempfile
 import unittest
-from main import Scanner
+from app.scanner import Scanner, Err, TokenType
+from app.regexscanner import RegexScanner
+from app.mappedscanner import MappedScanner, map_file
 
 
 class TestScanner(unittest.TestCase):
@@ -8,31 +13,111 @@ class TestScanner(unittest.TestCase):
         content = ['4322()']
         s = Scanner(content=content)
         ret = s.scan_nums(content[0][0:])
-        self.assertEqual(ret, ('NUMBER', '4322'))
+        self.assertEqual(ret, (TokenType.NUMBER, '4322'))
 
     def test_scan_number2(self) -> None:
         content = ['43.22()']
         s = Scanner(content=content)
         ret = s.scan_nums(content[0][0:])
-        self.assertEqual(ret, ('NUMBER', '43.22'))
+        self.assertEqual(ret, (TokenType.NUMBER, '43.22'))
 
     def test_scan_number3(self) -> None:
         content = ['432.2.2()']
         s = Scanner(content=content)
         ret = s.scan_nums(content[0][0:])
-        self.assertEqual(ret, ('NUMBER', '432.2'))
+        self.assertEqual(ret, (TokenType.NUMBER, '432.2'))
 
     def test_scan_number4(self) -> None:
         content = ['43a2.2.2()']
         s = Scanner(content=content)
         ret = s.scan_nums(content[0][0:])
-        self.assertEqual(ret, ('NUMBER', '43'))
+        self.assertEqual(ret, (TokenType.NUMBER, '43'))
 
     def test_scan_number5(self) -> None:
         content = ['4abc']
         s = Scanner(content=content)
         ret = s.scan_nums(content[0][0:])
-        self.assertEqual(ret, ('NUMBER', '4'))
+        self.assertEqual(ret, (TokenType.NUMBER, '4'))
+
+    def test_scan_number_offset(self) -> None:
+        content = 'var x = 43.2.2;'
+        s = Scanner(content=content)
+        ret = s.scan_nums(content, 8)
+        self.assertEqual(ret, (TokenType.NUMBER, '43.2'))
+
+    def test_scan_tokens(self) -> None:
+        s = Scanner('var s = "a\nb"; // done\nprint s >= 1;')
+        s.scan()
+        self.assertEqual([str(t) for t in s.tokens], [
+            'VAR var null', 'IDENTIFIER s null', 'EQUAL = null',
+            'STRING "a\nb" a\nb', 'SEMICOLON ; null', 'PRINT print null',
+            'IDENTIFIER s null', 'GREATER_EQUAL >= null', 'NUMBER 1 1.0',
+            'SEMICOLON ; null', 'EOF  null'])
+        self.assertEqual([t.line for t in s.tokens],
+                         [1, 1, 1, 2, 2, 3, 3, 3, 3, 3, 4])
+        self.assertEqual(s.ret, 0)
+
+    def test_scan_errors(self) -> None:
+        s = Scanner('@\n"open')
+        s.scan()
+        self.assertEqual([t.err for t in s.tokens],
+                         [Err.UNEXPECTED_CHAR, Err.UNTERMINATED_STRING, Err.NONE])
+        self.assertEqual(s.ret, 65)
+
+    def test_scan_stream(self) -> None:
+        content = 'print "a\nlong string";// comment\nvar x1 = 12.5 <= 3;\n@"open'
+        s = Scanner(content)
+        s.scan()
+        for chunk_size in (1, 2, 7, 1000):
+            stream = Scanner('')
+            tokens = list(stream.scan_stream(io.StringIO(content), chunk_size))
+            self.assertEqual([(str(t), t.line, t.err) for t in tokens],
+                             [(str(t), t.line, t.err) for t in s.tokens])
+            self.assertEqual(stream.ret, s.ret)
+
+    def test_regex_scanner(self) -> None:
+        # non ascii whitespace, letters and digits go through Scanner.scan_token
+        sources = ['var s = "a\nb"; // done\nprint s >= 1;', '@\n"open', '1.5.2. .5 //',
+                   'ab\xe9c 1\u0663 x\xa0y\x1c\x85z\u2028\n12\xe9 "\xe9\n" a_1!==<>/',
+                   '// only\n\n', '', '\n\n"x\n\ny"\n#\n']
+        for content in sources:
+            with self.subTest(content=content):
+                s = Scanner(content)
+                s.scan()
+                r = RegexScanner(content)
+                r.scan()
+                self.assertEqual([(str(t), t.line, t.err) for t in r.tokens],
+                                 [(str(t), t.line, t.err) for t in s.tokens])
+                self.assertEqual(r.ret, s.ret)
+                stream = RegexScanner('')
+                tokens = list(stream.scan_stream(io.StringIO(content), 3))
+                self.assertEqual([(str(t), t.line, t.err) for t in tokens],
+                                 [(str(t), t.line, t.err) for t in s.tokens])
+
+    def test_mapped_scanner(self) -> None:
+        # the tokens of the file read as text: \r\n and \r are line breaks
+        sources = ['var s = "a\nb"; // done\nprint s >= 1;', '@\r\n"open\r', '1.5.2. .5 //',
+                   'ab\xe9c 1\u0663 x\xa0y\x1c\x85z\u2028\n12\xe9 "\xe9\r\n" a_1!==<>/',
+                   '// a\rprint "x\ry";\r\n\xa0"b\nc"', '\ufeffvar\xa0"open\nstring', '']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'source.lox')
+            for content in sources:
+                with self.subTest(content=content):
+                    with open(path, 'w', encoding='utf-8', newline='') as file:
+                        file.write(content)
+                    with open(path, encoding='utf-8') as file:
+                        s = Scanner(file.read())
+                    s.scan()
+                    expected = [(str(t), t.line, t.err) for t in s.tokens]
+                    with open(path, 'rb') as file:
+                        m = MappedScanner(map_file(file))
+                    m.scan()
+                    self.assertEqual([(str(t), t.line, t.err) for t in m.tokens], expected)
+                    self.assertEqual(m.ret, s.ret)
+                    stream = MappedScanner()
+                    with open(path, 'rb') as file:
+                        tokens = list(stream.scan_stream(file))
+                    self.assertEqual([(str(t), t.line, t.err) for t in tokens], expected)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from app.batch import Command
+from app.main import execute
+from app.server import Server
+
+
+def slow(*args: object) -> None:
+    # a command that outlasts a short timeout
+    time.sleep(0.5)
+
+
+class TestServer(unittest.TestCase):
+    def serve(self, options: dict[str, str], requests: list, execute: Command = execute) -> list[dict]:
+        # busy holds, after each response, whether every worker was still taken
+        self.busy: list[bool] = []
+
+        async def session(path: str) -> list[dict]:
+            server = self.server = Server(path, options, execute)
+            listener = await server.start()
+            try:
+                reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+                responses = []
+                for request in requests:
+                    writer.write(json.dumps(request).encode() + b'\n')
+                    await writer.drain()
+                    responses.append(json.loads(await reader.readline()))
+                    self.busy.append(server.slots.locked())
+                writer.close()
+                return responses
+            finally:
+                listener.close()
+                server.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            return asyncio.run(session(os.path.join(directory, 'lox.sock')))
+
+    def test_requests(self) -> None:
+        responses = self.serve({'max-steps': '6'}, [
+            {'id': 7, 'command': 'run', 'source': 'var a = 1; print a + 1;'},
+            {'command': 'run', 'source': 'print 1; print 2; print 3; print 4;'},
+            {'command': 'evaluate', 'source': '-"x"', 'options': {'engine': 'stack'}},
+            {'command': 'serve', 'source': ''},
+        ])
+        self.assertEqual(responses[0], {'id': 7, 'code': 0, 'stdout': '2\n', 'stderr': ''})
+        self.assertEqual(responses[1], {'code': 75, 'stdout': '1\n2\n3\n',
+                                        'stderr': 'Step limit of 6 exceeded.\n'})
+        self.assertEqual(responses[2]['stderr'], 'Operand must be a number.\n')
+        self.assertEqual(responses[3]['code'], 1)
+
+    def test_timeout(self) -> None:
+        responses = self.serve({'timeout': '1e-9'}, [{'command': 'run', 'source': 'print 1;'}])
+        self.assertEqual(responses[0]['code'], 75)
+        assert (responses[0]['stderr'].startswith('Request timed out'))
+
+    def test_timeout_keeps_slot(self) -> None:
+        # the worker is still busy after the timeout, its slot stays taken
+        responses = self.serve({'timeout': '0.05', 'jobs': '1'}, [{'command': 'run', 'source': ''}], slow)
+        self.assertEqual(responses[0]['code'], 75)
+        self.assertEqual(self.busy, [True])
+
+    def test_long_request(self) -> None:
+        # past asyncio's default limit of 64KiB a line
+        source = 'print "' + 'x' * 100000 + '";'
+        responses = self.serve({}, [{'command': 'run', 'source': source}])
+        self.assertEqual(responses[0], {'code': 0, 'stdout': 'x' * 100000 + '\n', 'stderr': ''})
+        # over the server's limit the request is refused, the connection kept
+        with mock.patch('app.server.MAX_REQUEST', 1000):
+            responses = self.serve({}, [{'command': 'run', 'source': source},
+                                        {'command': 'run', 'source': 'print 1;'}])
+        self.assertEqual(responses[0]['stderr'], 'Bad request: longer than 1000 bytes\n')
+        self.assertEqual(responses[1]['stdout'], '1\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
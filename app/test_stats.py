@@ -0,0 +1,34 @@
+import io
+import tracemalloc
+import unittest
+from app.main import execute
+from app.output import Output
+from app.stats import Stats
+
+
+class TestStats(unittest.TestCase):
+    def run_command(self, command: str, source: str, stats: Stats) -> dict:
+        self.addCleanup(tracemalloc.stop)
+        out = Output(io.StringIO(), io.StringIO())
+        try:
+            execute(command, '<test>', {}, out, source, stats)
+        except SystemExit:
+            pass
+        return stats.json(command)
+
+    def test_run(self) -> None:
+        report = self.run_command('run', 'var a = 1;\nprint a + 2;', Stats())
+        self.assertEqual(list(report['phases']), ['scan', 'parse', 'execute'])
+        self.assertEqual((report['tokens'], report['nodes']), (11, 6))
+        for phase in report['phases'].values():
+            assert (phase['seconds'] >= 0 and phase['peak_bytes'] > 0)
+        assert ('tokens_per_second' in report['phases']['scan'])
+
+    def test_time_only(self) -> None:
+        report = self.run_command('evaluate', '1 + ', Stats(memory=False))
+        self.assertEqual(list(report['phases']), ['scan', 'parse'])
+        assert ('peak_bytes' not in report['phases']['scan'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import io
+import unittest
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.output import Output
+from app.cache import dump_program, load_program
+from app.transpiler import PythonInterpreter
+from app.AST import *
+
+
+def parse(source: str) -> list[Stmt]:
+    s = Scanner(source)
+    s.scan()
+    return Parser(s.tokens).parse()
+
+
+def run(interpreter: PythonInterpreter) -> tuple[str, str]:
+    stream = io.StringIO()
+    interpreter.out = Output(stream)
+    try:
+        interpreter.interpret()
+    except RuntimeError as e:
+        return stream.getvalue(), str(e)
+    return stream.getvalue(), ''
+
+
+class TestTranspiler(unittest.TestCase):
+    def test_cached_program(self) -> None:
+        source = 'var a = 2; print a * 3 + 1; print "x" + "y"; print b;'
+        interpreter = PythonInterpreter(parse(source))
+        expected = ('7\nxy\n', 'Undefined variable b .')
+        self.assertEqual(run(interpreter), expected)
+        program, removed, inferred = load_program(dump_program(interpreter.program, 4, (2, 3)))
+        self.assertEqual((removed, inferred), (4, (2, 3)))
+        cached = PythonInterpreter(())
+        cached.program = program
+        self.assertEqual(run(cached), expected)
+
+    def test_order(self) -> None:
+        # operands are read left to right, before the ones after them are evaluated
+        source = 'var a = 1; print a + (a = 2); print (a = 3) + a; print c + (1 - "x"); var c;'
+        self.assertEqual(run(PythonInterpreter(parse(source))),
+                         ('3\n6\n', 'Undefined variable c .'))
+
+    def test_deep(self) -> None:
+        # the generated code is flat, nesting is not limited by the python parser
+        depth = 5000
+        source = 'print ' + '(' * depth + '1' + ' + 1)' * depth + ';'
+        self.assertEqual(run(PythonInterpreter(parse(source))), (f'{depth + 1}\n', ''))
+
+    def test_constants(self) -> None:
+        stmts = [PrintStmt(Binary(Literal(float('inf')), Literal(1.0), TokenType.GREATER)),
+                 PrintStmt(Unary(TokenType.MINUS, Literal(float('-inf'))))]
+        self.assertEqual(run(PythonInterpreter(stmts)), ('true\ninf\n', ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
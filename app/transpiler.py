@@ -0,0 +1,175 @@
+import math
+import re
+import sys
+from types import CodeType
+from typing import Any, Iterable
+from app.AST import *
+from app.interpreter import Interpreter
+from app.output import Output
+from app.limits import Limits
+
+# a compiled program: the code of a module defining RUN, the variable names by
+# slot for the undefined variable errors and the constants that have no python
+# literal. all of it marshals, so the program can be cached like the AST
+Program = tuple[CodeType, tuple[str, ...], tuple[Any, ...]]
+
+RUN = '__lox__'
+# a python float literal
+FLOAT = re.compile(r'\d+\.\d*(e[+-]\d+)?')
+# what the generated function is called with, in this order
+PARAMETERS = ('line', 'stringfy', 'add', 'concat', 'numbers', 'number', 'charge', 'constants')
+# the slot of the python local a variable lives in
+LOCAL = re.compile(r"'v(\d+)'")
+
+ARITHMETIC: dict[TokenType, str] = {
+    TokenType.PLUS: '+',
+    TokenType.MINUS: '-',
+    TokenType.STAR: '*',
+    TokenType.SLASH: '/',
+    TokenType.GREATER: '>',
+    TokenType.GREATER_EQUAL: '>=',
+    TokenType.LESS: '<',
+    TokenType.LESS_EQUAL: '<=',
+}
+
+
+def program_tag(limited: bool, typed: bool = False) -> str:
+    # what a cached Program depends on besides the source: the bytecode
+    # version, whether it charges its steps and skips the checks
+    # TypeInference proved unneeded
+    return f'python:{sys.implementation.cache_tag}:{int(limited)}:{int(typed)}'
+
+
+def numbers() -> None:
+    raise RuntimeError('Operands must be numbers.')
+
+
+def number() -> None:
+    raise RuntimeError('Operand must be a number.')
+
+
+class Transpiler():
+    # turns resolved statements into the lines of one python function. lox
+    # variables become its locals v<slot>, so reading one before it is set
+    # raises NameError (UnboundLocalError, or for a variable never set a
+    # missing global) where Env would raise its undefined error.
+    # an expression becomes one line per node in evaluation order, each
+    # storing the node's value in a temporary t<n>, so nothing is nested and
+    # any depth compiles. an operator on two floats runs inline, other
+    # operands go to the evaluator's add or raise the same errors. operations
+    # typed by TypeInference skip the checks
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.constants: list[Any] = []
+        self.temps = 0
+
+    def temp(self, code: str) -> str:
+        self.temps += 1
+        self.lines.append(f'    t{self.temps} = {code}')
+        return f't{self.temps}'
+
+    def stmt(self, stmt: Stmt) -> None:
+        self.temps = 0
+        if isinstance(stmt, PrintStmt):
+            self.lines.append(f'    line(stringfy({self.expr(stmt.expr)}))')
+        elif isinstance(stmt, ExprStmt):
+            self.lines.append(f'    {self.expr(stmt.expr)}')
+        else:
+            value = self.expr(stmt.expr) if stmt.expr else 'None'
+            self.lines.append(f'    v{stmt.slot} = {value}')
+
+    def expr(self, expr: Expr) -> str:
+        # returns the python expression of the value: a literal or a temporary,
+        # both keep their value while the rest of the statement runs
+        stack: list[str] = []
+        for node in postorder(expr):
+            kind = type(node)
+            if kind is Literal:
+                stack.append(self.literal(node.value))
+            elif kind is Variable:
+                # read where the tree walker would, before the operands after it
+                stack.append(self.temp(f'v{node.slot}'))
+            elif kind is Binary:
+                right = stack.pop()
+                stack.append(self.binary(node, stack.pop(), right))
+            elif kind is Unary:
+                operand = stack.pop()
+                if node.op == TokenType.BANG:
+                    stack.append(self.temp(f'not {operand}'))
+                elif node.operands:
+                    stack.append(self.temp(f'-{operand}'))
+                else:
+                    stack.append(self.temp(f'-{operand} if type({operand}) is float else number()'))
+            elif kind is Assign:
+                self.lines.append(f'    v{node.slot} = {stack[-1]}')
+        return stack[-1]
+
+    def literal(self, value: Any) -> str:
+        if type(value) is float and not math.isfinite(value):
+            self.constants.append(value)
+            return f'constants[{len(self.constants) - 1}]'
+        return repr(value)
+
+    def binary(self, node: Binary, left: str, right: str) -> str:
+        op = node.op
+        if node.operands is Type.STRING:
+            return self.temp(f'concat({left}, {right})')
+        if op == TokenType.EQUAL_EQUAL:
+            return self.temp(f'{left} == {right}')
+        if op == TokenType.BANG_EQUAL:
+            return self.temp(f'{left} != {right}')
+        # operands that are float literals need no check
+        checks = [f'type({operand}) is float' for operand in (left, right)
+                  if not FLOAT.fullmatch(operand) and not node.operands]
+        code = f'{left} {ARITHMETIC[op]} {right}'
+        if checks:
+            other = f'add({left}, {right})' if op == TokenType.PLUS else 'numbers()'
+            code = f'{code} if {" and ".join(checks)} else {other}'
+        return self.temp(code)
+
+
+class PythonInterpreter(Interpreter):
+    # compiles the whole program to python bytecode once and runs it, output
+    # and runtime errors are the same as Interpreter. like VM it compiles all
+    # statements before running any, a streamed program is parsed to the end
+    # first. self.program may be set to a Program loaded from the cache, the
+    # statements are not used then
+    def __init__(self, stmts: Iterable[Stmt], out: Output | None = None,
+                 limits: Limits | None = None) -> None:
+        super().__init__(stmts, None, out, limits)
+        self.program: Program | None = None
+
+    def compile(self) -> Program:
+        transpiler = Transpiler()
+        lines = transpiler.lines
+        lines.append(f'def {RUN}({", ".join(PARAMETERS)}):')
+        for stmt in self.stmts:
+            stmt = self.resolver.resolve(stmt)
+            if self.limits is not None:
+                lines.append(f'    charge({self.resolver.cost})')
+            transpiler.stmt(stmt)
+        lines.append('    pass')
+        code = compile('\n'.join(lines), '<lox>', 'exec')
+        return code, tuple(self.evaluator.env.names), tuple(transpiler.constants)
+
+    def interpret(self) -> None:
+        limits = self.limits
+        try:
+            if self.program is None:
+                self.program = self.compile()
+            code, names, constants = self.program
+            namespace: dict[str, Any] = {}
+            exec(code, namespace)
+            if limits is not None:
+                limits.start()
+            try:
+                namespace[RUN](self.out.line, self.evaluator.stringfy,
+                               self.evaluator.binary_ops[TokenType.PLUS], self.evaluator.concat,
+                               numbers, number,
+                               limits.charge if limits else None, constants)
+            except NameError as e:
+                if (m := LOCAL.search(str(e))) is None:
+                    raise
+                raise RuntimeError(f'Undefined variable {names[int(m[1])]} .') from None
+        finally:
+            self.out.flush()
@@ -0,0 +1,133 @@
+from typing import Any, Iterator
+from app.bytecode import *
+from app.env import UNDEFINED
+from app.interpreter import Interpreter
+from app.rope import STRINGS, concat
+
+
+class VM(Interpreter):
+    # runs the statements compiled to bytecode instead of walking the AST,
+    # output and runtime errors are the same as Interpreter
+
+    def interpret(self) -> None:
+        compiler = Compiler()
+        if self.limits is None:
+            stmts = map(self.resolver.resolve, self.stmts)
+        else:
+            self.limits.start()
+            stmts = self.charged(compiler)
+        try:
+            if isinstance(self.stmts, list):
+                self.run(compiler.compile(stmts))
+            else:
+                # streamed statements run as they are parsed: each one's code
+                # takes the place of the one before, the constants are kept
+                chunk = compiler.chunk
+                for stmt in stmts:
+                    compiler.stmt(stmt)
+                    compiler.emit(RETURN)
+                    self.run(chunk)
+                    chunk.code = []
+        finally:
+            self.out.flush()
+
+    def charged(self, compiler: Compiler) -> Iterator[Stmt]:
+        # resolves the statements for compile, putting the STEP charging each
+        # one in front of its code
+        for stmt in self.stmts:
+            stmt = self.resolver.resolve(stmt)
+            compiler.emit(STEP, self.resolver.cost)
+            yield stmt
+
+    def run(self, chunk: Chunk) -> None:
+        code = chunk.code
+        constants = chunk.constants
+        env = self.evaluator.env
+        values = env.values
+        stringfy = self.evaluator.stringfy
+        line = self.out.line
+        limits = self.limits
+        max_string = limits.max_string if limits else 0
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        # the dispatch below runs once per instruction, keep what it touches local
+        _float, _STRINGS = float, STRINGS
+        _RIGHT_CONST, _RIGHT_VAR, _BINARY_END = RIGHT_CONST, RIGHT_VAR, BINARY_END
+        _ADD, _LESS_EQUAL, _EQUAL = ADD, LESS_EQUAL, EQUAL
+        _SUB, _MUL, _DIV, _GREATER, _GREATER_EQUAL, _LESS = SUB, MUL, DIV, GREATER, GREATER_EQUAL, LESS
+        _CONST, _GET, _SET, _DEFINE = CONST, GET, SET, DEFINE
+        _NEGATE, _NOT, _POP, _PRINT, _STEP = NEGATE, NOT, POP, PRINT, STEP
+        # there are no jumps yet so the code is read straight through in (op, arg) pairs
+        instructions = iter(code)
+        for op, arg in zip(instructions, instructions):
+            if op < _BINARY_END:
+                if op < _RIGHT_CONST:
+                    right = pop()
+                elif op < _RIGHT_VAR:
+                    right = constants[arg]
+                    op -= _RIGHT_CONST
+                else:
+                    right = values[arg]
+                    if right is UNDEFINED:
+                        env.get_at(arg)
+                    op -= _RIGHT_VAR
+                left = stack[-1]
+                if op == _ADD:
+                    if type(left) is _float and type(right) is _float:
+                        stack[-1] = left + right
+                    elif type(left) in _STRINGS and type(right) in _STRINGS:
+                        # a str or a Rope, the limit applies to both
+                        if max_string:
+                            limits.concat(left, right)
+                        stack[-1] = concat(left, right)
+                    elif type(left) is type(right):
+                        stack[-1] = left + right
+                    else:
+                        raise RuntimeError(
+                            'Operands must be two numbers or two strings.')
+                elif op <= _LESS_EQUAL:
+                    if not (type(left) is _float and type(right) is _float):
+                        raise RuntimeError('Operands must be numbers.')
+                    if op == _SUB:
+                        stack[-1] = left - right
+                    elif op == _MUL:
+                        stack[-1] = left * right
+                    elif op == _DIV:
+                        stack[-1] = left / right
+                    elif op == _GREATER:
+                        stack[-1] = left > right
+                    elif op == _GREATER_EQUAL:
+                        stack[-1] = left >= right
+                    elif op == _LESS:
+                        stack[-1] = left < right
+                    else:
+                        stack[-1] = left <= right
+                elif op == _EQUAL:
+                    stack[-1] = left == right
+                else:
+                    stack[-1] = left != right
+            elif op == _CONST:
+                push(constants[arg])
+            elif op == _GET:
+                if values[arg] is UNDEFINED:
+                    env.get_at(arg)
+                push(values[arg])
+            elif op == _PRINT:
+                line(stringfy(pop()))
+            elif op == _NEGATE:
+                if type(stack[-1]) is not _float:
+                    raise RuntimeError('Operand must be a number.')
+                stack[-1] = -stack[-1]
+            elif op == _NOT:
+                stack[-1] = not stack[-1]
+            elif op == _SET:
+                values[arg] = stack[-1]
+            elif op == _DEFINE:
+                values[arg] = pop()
+            elif op == _POP:
+                pop()
+            elif op == _STEP:
+                limits.charge(arg)
+            else:
+                return
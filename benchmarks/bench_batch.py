@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_batch [scripts] [statements]
+# runs the same small scripts once as a process per script, as the run command
+# is used today, and once through batch with one worker and one per CPU
+
+
+def timed(args: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(args, stdout=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(n):
+            with open(os.path.join(directory, f'{i:06}.lox'), 'w') as file:
+                file.write(statements(size, i))
+        program = [sys.executable, '-m', 'app.main']
+
+        # a process per script is slow enough that a sample is timed
+        sample = sorted(os.listdir(directory))[:min(n, 50)]
+        start = time.perf_counter()
+        for name in sample:
+            subprocess.run(program + ['run', os.path.join(directory, name)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        process = (time.perf_counter() - start) / len(sample) * n
+        print(f'{n} scripts of {size} statements, {os.cpu_count()} CPUs')
+        print(f'{"process each":<14} {process:8.3f}s  (from {len(sample)} scripts)')
+        for jobs in sorted({1, os.cpu_count() or 1}):
+            seconds = timed(program + ['batch', directory, f'--jobs={jobs}'])
+            print(f'{f"batch jobs={jobs}":<14} {seconds:8.3f}s  {process / seconds:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import app.rope
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.vm import VM
+from app.closures import ClosureInterpreter
+from app.stackeval import StackInterpreter
+from app.output import Output
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_concat [appends]
+# a script building one string by s = s + "..." appends, then printing it,
+# at 1x, 2x and 4x appends on each engine with strings joined by ropes and
+# by copying (ROPE_MIN raised past any length). microseconds per append stay
+# flat when the cost is linear and grow with the size when it is quadratic
+
+ENGINES = (Interpreter, VM, ClosureInterpreter, StackInterpreter)
+
+
+def source(n: int) -> str:
+    return 'var s = "";\n' + 's = s + "0123456789abcdef";\n' * n + 'print s;\n'
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rope_min = app.rope.ROPE_MIN
+    for size in (n, 2 * n, 4 * n):
+        s = Scanner(source(size))
+        s.scan()
+        stmts = Parser(s.tokens).parse()
+        for engine in ENGINES:
+            row = f'{engine.__name__:<18} {size:>7}'
+            for name, threshold in (('rope', rope_min), ('copy', sys.maxsize)):
+                app.rope.ROPE_MIN = threshold
+
+                def run() -> None:
+                    with open(os.devnull, 'w') as stream:
+                        engine(stmts, out=Output(stream)).interpret()
+                seconds = timed(run, 3)
+                row += f'  {name} {seconds:7.3f}s {seconds / size * 1e6:6.2f}us'
+            print(row)
+    app.rope.ROPE_MIN = rope_min
+
+
+if __name__ == '__main__':
+    main()
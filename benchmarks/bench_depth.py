@@ -0,0 +1,48 @@
+import sys
+from typing import Callable
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.stackeval import StackInterpreter
+from benchmarks.generators import nested
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_depth [depth]
+# one statement per shape nested depth deep: parentheses, a left-deep "+"
+# chain and a unary chain, evaluated by the recursive tree walker and by the
+# explicit stack evaluator; then both on the shallow nested workload, best of 5
+
+SHAPES: dict[str, Callable[[int], str]] = {
+    'parens': lambda depth: 'print ' + '(' * depth + '1' + ')' * depth + ';',
+    'chain': lambda depth: 'print 1' + ' + 1' * depth + ';',
+    'unary': lambda depth: 'print ' + '-' * depth + '1;',
+}
+
+
+def parse(source: str) -> list:
+    s = Scanner(source)
+    s.scan()
+    return Parser(s.tokens).parse()
+
+
+def main() -> None:
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engines = (('tree', Interpreter), ('stack', StackInterpreter))
+    for shape, source in SHAPES.items():
+        stmts = parse(source(depth))
+        for name, engine in engines:
+            try:
+                seconds = timed(lambda: engine(stmts).interpret())
+                print(f'{shape:<7} {name:<6} {seconds:8.3f}s  depth {depth}')
+            except RecursionError:
+                print(f'{shape:<7} {name:<6} RecursionError at depth {depth}')
+
+    stmts = parse(nested(2000))
+    for name, engine in engines:
+        seconds = timed(lambda: engine(stmts).interpret())
+        print(f'{"nested":<7} {name:<6} {seconds:8.3f}s  depth 24')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import gc
+import io
+import sys
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.bytecode import Compiler
+from app.vm import VM
+from app.closures import ClosureInterpreter
+from app.transpiler import PythonInterpreter
+from app.output import Output
+from benchmarks.generators import arithmetic
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_engines [statements]
+# times the same parsed arithmetic-heavy script on each engine, best of 5 runs
+# with stdout discarded. 'interpret' includes compiling, 'run' is the
+# precompiled code only, for python the compiled (or cached) program.
+
+
+def report(engine: str, phase: str, seconds: float, baseline: float) -> None:
+    print(f'{engine:<8} {phase:<9} {seconds:8.3f}s  {baseline / seconds:5.2f}x')
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    s = Scanner(arithmetic(n))
+    s.scan()
+    stmts = Parser(s.tokens).parse()
+
+    tree = timed(lambda: Interpreter(stmts).interpret())
+    report('tree', 'interpret', tree, tree)
+
+    report('vm', 'interpret', timed(lambda: VM(stmts).interpret()), tree)
+    # engines made outside timed print to the stdout of that moment, not the redirect
+    vm = VM(stmts, out=Output(io.StringIO()))
+    chunk = Compiler().compile(map(vm.resolver.resolve, stmts))
+    report('vm', 'run', timed(lambda: vm.run(chunk)), tree)
+
+    report('closure', 'interpret', timed(
+        lambda: ClosureInterpreter(stmts).interpret()), tree)
+    # keep the collector from rescanning the heap while a million closures are built
+    gc.disable()
+    closure = ClosureInterpreter(stmts)
+    compiled = [closure.compile(closure.resolver.resolve(stmt)) for stmt in stmts]
+    gc.enable()
+    report('closure', 'run', timed(lambda: [fn() for fn in compiled]), tree)
+
+    # compiling takes most of python's interpret, once is enough
+    report('python', 'interpret', timed(lambda: PythonInterpreter(stmts).interpret(), 1), tree)
+    python = PythonInterpreter(stmts, out=Output(io.StringIO()))
+    python.program = python.compile()
+    report('python', 'run', timed(python.interpret), tree)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import random
+import statistics
+import sys
+import time
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.incremental import Document
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_incremental [statements ...]
+# replays edit traces on generated sources of each size (1000, 10000 and
+# 100000 statements by default) and prints the median and the slowest edit
+# next to scanning and parsing the whole source again. the traces: typing a
+# statement on a new line in the middle a character at a time, deleting it
+# again with backspace, lines put in and taken out there, and spaces typed at
+# random places. strings span lines, so typing a " changes how all of the
+# rest scans until the string is closed: those edits cost about as much as
+# scanning the whole file, the slowest of typing and backspace.
+#
+# the medians grow with the size of the source, more slowly than a full scan
+# and parse: every edit builds the text again and splices the token list,
+# and one far from the edit before moves the gaps across the tokens between
+# them, which is most of the time of scattered edits
+
+
+def typing(text: str, rnd: random.Random) -> list[tuple[int, int, str]]:
+    offset = text.index('\n', len(text) // 2) + 1
+    trace = [(offset, 0, '\n')]
+    trace += [(offset + i, 0, char) for i, char in enumerate('var typed = (1 + 2) * 3 - "x";')]
+    return trace
+
+
+def backspace(text: str, rnd: random.Random) -> list[tuple[int, int, str]]:
+    # after typing, the typed line taken out again
+    offset = text.index('\n', len(text) // 2) + 1
+    line = 'var typed = (1 + 2) * 3 - "x";\n'
+    return [(offset + i, 1, '') for i in reversed(range(len(line)))]
+
+
+def scattered(text: str, rnd: random.Random) -> list[tuple[int, int, str]]:
+    trace = []
+    for _ in range(30):
+        trace.append((rnd.randrange(len(text)), 0, ' '))
+    return trace
+
+
+def lines(text: str, rnd: random.Random) -> list[tuple[int, int, str]]:
+    offset = text.index('\n', len(text) // 2) + 1
+    return [(offset, 0, '\n'), (offset, 1, '')] * 10
+
+
+TRACES = {'typing': typing, 'backspace': backspace, 'lines': lines, 'scattered': scattered}
+
+
+def full(text: str) -> float:
+    start = time.perf_counter()
+    s = Scanner(text)
+    s.scan()
+    try:
+        Parser(iter(s.tokens)).parse()
+    except SyntaxError:
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    for n in sizes:
+        text = statements(n)
+        print(f'{n} statements, {len(text) / 1e6:.2f}MB: full scan and parse {full(text) * 1e3:.1f}ms')
+        doc = Document(text)
+        for name, trace in TRACES.items():
+            times = []
+            for edit in trace(doc.text, random.Random(0)):
+                start = time.perf_counter()
+                doc.edit(*edit)
+                times.append(time.perf_counter() - start)
+            print(f'  {name:<10} {len(times):>3} edits  median {statistics.median(times) * 1e6:9.1f}us'
+                  f'  slowest {max(times) * 1e3:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.inference import TypeInference
+from app.interpreter import Interpreter
+from app.closures import ClosureInterpreter
+from app.stackeval import StackInterpreter
+from app.transpiler import PythonInterpreter
+from app.output import Output
+from benchmarks.generators import arithmetic
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_infer [statements]
+# the arithmetic script on each engine that reads the inferred types, as
+# parsed and after TypeInference, best of 3 runs. every operation of the
+# script is specialized, so this is the most inference can save
+
+ENGINES = (Interpreter, ClosureInterpreter, StackInterpreter, PythonInterpreter)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = arithmetic(n)
+    s = Scanner(source)
+    s.scan()
+    plain = Parser(s.tokens).parse()
+    # the inferred types are stored in the nodes, they get a tree of their own
+    typed = Parser(s.tokens).parse()
+    inference = TypeInference()
+    start = time.perf_counter()
+    typed = list(inference.infer(typed))
+    print(f'inference {time.perf_counter() - start:.3f}s, specialized '
+          f'{inference.specialized} of {inference.operations} operations')
+    for engine in ENGINES:
+        times = []
+        for stmts in (plain, typed):
+            def run() -> None:
+                with open(os.devnull, 'w') as stream:
+                    engine(stmts, out=Output(stream)).interpret()
+            times.append(timed(run, 3))
+        print(f'{engine.__name__:<18} checked {times[0]:7.3f}s  typed {times[1]:7.3f}s'
+              f'  {times[0] / times[1]:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
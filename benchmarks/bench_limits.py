@@ -0,0 +1,34 @@
+import sys
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.vm import VM
+from app.closures import ClosureInterpreter
+from app.stackeval import StackInterpreter
+from app.limits import Limits
+from benchmarks.generators import arithmetic, statements
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_limits [statements]
+# each engine on the arithmetic and the mixed statements workloads with
+# limits off and with every limit on but set too high to be hit, best of 5
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    engines = (('tree', Interpreter), ('vm', VM), ('closure', ClosureInterpreter),
+               ('stack', StackInterpreter))
+    print(f'{"workload":<10} {"engine":<8} {"off":>8} {"on":>8} {"overhead":>9}')
+    for workload, source in (('arith', arithmetic(n)), ('mixed', statements(n))):
+        s = Scanner(source)
+        s.scan()
+        stmts = Parser(s.tokens).parse()
+        for name, engine in engines:
+            off = timed(lambda: engine(stmts).interpret())
+            on = timed(lambda: engine(stmts, limits=Limits(10 ** 9, 3600.0, 1 << 30)).interpret())
+            print(f'{workload:<10} {name:<8} {off:7.3f}s {on:7.3f}s {(on / off - 1) * 100:8.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import dataclasses
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from app.scanner import Scanner, Token
+from app.RDParser import Parser
+from app.AST import Expr, Stmt
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_memory [statements]
+# bytes allocated per Token and per AST node. 'dict' rebuilds the same objects
+# with a per-instance __dict__ and string token types (the layout before
+# __slots__), 'slots' rebuilds them with the current classes. lexeme strings
+# and literal values are shared by both so only the object layout is measured
+
+
+class DictToken:
+    def __init__(self, type: str, lexme: str, literal: Any, line: int, err: Any) -> None:
+        self.type = type
+        self.lexme = lexme
+        self.literal = literal
+        self.line = line
+        self.err = err
+
+
+DICT_NODES: dict[type, type] = {}
+
+
+def dict_node(node: Any) -> Any:
+    if not isinstance(node, (Expr, Stmt)):
+        return node
+    cls = DICT_NODES.setdefault(type(node), type(type(node).__name__, (), {}))
+    copy = cls()
+    for f in dataclasses.fields(node):
+        setattr(copy, f.name, dict_node(getattr(node, f.name)))
+    return copy
+
+
+def slots_node(node: Any) -> Any:
+    if not isinstance(node, (Expr, Stmt)):
+        return node
+    return type(node)(*(slots_node(getattr(node, f.name)) for f in dataclasses.fields(node)))
+
+
+def count_nodes(node: Any) -> int:
+    if not isinstance(node, (Expr, Stmt)):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, f.name)) for f in dataclasses.fields(node))
+
+
+def allocated(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    s = Scanner(statements(n))
+    s.scan()
+    tokens = s.tokens
+    stmts = Parser(tokens).parse()
+    nodes = sum(count_nodes(stmt) for stmt in stmts)
+
+    print(f'{len(tokens)} tokens, {nodes} nodes')
+    print(f'{"layout":<6} {"B/token":>8} {"B/node":>8}')
+    for layout, token, node in (
+            ('dict', lambda t: DictToken(t.type.name, t.lexme, t.literal, t.line, t.err), dict_node),
+            ('slots', lambda t: Token(t.type, t.lexme, t.literal, t.line, t.err), slots_node)):
+        token_bytes = allocated(lambda: [token(t) for t in tokens])
+        node_bytes = allocated(lambda: [node(stmt) for stmt in stmts])
+        print(f'{layout:<6} {token_bytes / len(tokens):>8.1f} {node_bytes / nodes:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
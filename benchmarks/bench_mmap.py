@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterator
+
+from app.scanner import Token, TokenType
+from app.regexscanner import RegexScanner
+from app.mappedscanner import MappedScanner
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_mmap [statements]
+# streams the tokens of a generated source file without keeping them, each
+# input layer in a fresh process: 'read' decodes the whole file into a str
+# first (what tokenize and run do), 'chunks' reads it 64k characters at a time
+# (--stream), 'mmap' maps it (--mmap). prints the time to the first token, the
+# total time and how much the peak RSS grew while scanning. Linux only
+
+
+def read(path: str) -> Iterator[Token]:
+    with open(path, encoding='utf-8') as file:
+        s = RegexScanner(file.read())
+    pos, end = 0, len(s.content)
+    while pos < end:
+        token, pos = s.scan_token(pos)
+        if token:
+            yield token
+    yield Token(TokenType.EOF, '', 'null', s.line_number + 1)
+
+
+def chunks(path: str) -> Iterator[Token]:
+    with open(path, encoding='utf-8') as file:
+        yield from RegexScanner('').scan_stream(file)
+
+
+def mapped(path: str) -> Iterator[Token]:
+    with open(path, 'rb') as file:
+        yield from MappedScanner().scan_stream(file)
+
+
+LAYERS = {'read': read, 'chunks': chunks, 'mmap': mapped}
+
+
+def status(field: str) -> int:
+    # a size in kB from /proc/self/status: VmRSS now, VmHWM the peak. the peak
+    # of ru_maxrss may be the parent's from before the child was started
+    with open('/proc/self/status') as file:
+        for line in file:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def child(layer: str, path: str) -> None:
+    before = status('VmRSS')
+    start = time.perf_counter()
+    tokens = LAYERS[layer](path)
+    next(tokens)
+    first = time.perf_counter() - start
+    count = 1 + sum(1 for _ in tokens)
+    total = time.perf_counter() - start
+    grown = status('VmHWM') - before
+    print(f'{layer:<7} {count} tokens  first {first * 1e3:8.2f}ms  total {total:6.2f}s'
+          f'  peak rss +{grown / 1024:6.1f}MB')
+
+
+def main() -> None:
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3])
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'source.lox')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(statements(n))
+        print(f'{os.path.getsize(path) / 1e6:.1f}MB source')
+        for layer in LAYERS:
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_mmap', '--child', layer, path],
+                           check=True)
+
+
+if __name__ == '__main__':
+    main()
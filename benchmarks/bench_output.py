@@ -0,0 +1,55 @@
+import os
+import sys
+from typing import Callable, TextIO
+
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.interpreter import Interpreter
+from app.output import Output
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_output [lines]
+# writes lines to os.devnull one print() per line as before, through an
+# Output that writes every line (--buffer=0) and through a buffered Output;
+# then runs a script of that many print statements with each, best of 3
+
+
+def printed(lines: list[str], stream: TextIO) -> Callable[[], None]:
+    def run() -> None:
+        for line in lines:
+            print(line, file=stream)
+        stream.flush()
+    return run
+
+
+def sink(lines: list[str], stream: TextIO, threshold: int | None) -> Callable[[], None]:
+    def run() -> None:
+        out = Output(stream, threshold=threshold)
+        for line in lines:
+            out.line(line)
+        out.flush()
+    return run
+
+
+def interpreted(stmts: list, stream: TextIO, threshold: int | None) -> Callable[[], None]:
+    return lambda: Interpreter(stmts, out=Output(stream, threshold=threshold)).interpret()
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    lines = [str(i) for i in range(n)]
+    s = Scanner(''.join(f'print {i};\n' for i in range(n)))
+    s.scan()
+    stmts = Parser(s.tokens).parse()
+    with open(os.devnull, 'w') as stream:
+        base = timed(printed(lines, stream), 3)
+        print(f'{"print()":<18} {base:8.3f}s')
+        for name, threshold in (('unbuffered', 0), ('buffered', None)):
+            seconds = timed(sink(lines, stream, threshold), 3)
+            print(f'{name:<18} {seconds:8.3f}s  {base / seconds:5.2f}x')
+        for name, threshold in (('run unbuffered', 0), ('run buffered', None)):
+            print(f'{name:<18} {timed(interpreted(stmts, stream, threshold), 3):8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+from app.scanner import Scanner
+from app.regexscanner import RegexScanner
+from app.parallel import CHUNK_MIN, boundaries, scan_parallel
+from benchmarks.generators import statements
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_parallel [statements] [max workers]
+# scans one generated source with scan_parallel on 1 to max workers (the
+# number of cores by default), best of 3, for both scanners. 1 worker is the
+# plain sequential scan; the others include starting the pool and rebuilding
+# the tokens in this process, so they only pay off with a core per worker
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    content = statements(n)
+    start = time.perf_counter()
+    offsets = boundaries(content, len(content) // CHUNK_MIN)
+    print(f'{len(content) / 1e6:.1f}MB source, {len(offsets) - 1} chunks found in '
+          f'{(time.perf_counter() - start) * 1e3:.1f}ms')
+    for cls in (Scanner, RegexScanner):
+        sequential = timed(lambda: scan_parallel(cls(content), 1), 3)
+        for jobs in range(1, max(workers, 1) + 1):
+            seconds = sequential if jobs == 1 else timed(lambda: scan_parallel(cls(content), jobs), 3)
+            print(f'{cls.__name__:<13} {jobs:>3} workers {seconds:7.3f}s  {sequential / seconds:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
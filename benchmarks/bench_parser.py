@@ -0,0 +1,42 @@
+import sys
+
+from app.scanner import Scanner
+from app.RDParser import LadderParser, Parser
+from app.interpreter import Interpreter
+from benchmarks.generators import nested
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.bench_parser [statements] [depth]
+# parse and tree-walk evaluation time of deeply nested expressions, best of 5;
+# parse is compared against the recursive descent ladder, which also gets a
+# single expression nested far past the recursion limit
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    s = Scanner(nested(n, depth))
+    s.scan()
+    stmts = Parser(s.tokens).parse()
+
+    parse = timed(lambda: Parser(s.tokens).parse())
+    ladder = timed(lambda: LadderParser(s.tokens).parse())
+    evaluate = timed(lambda: Interpreter(stmts).interpret())
+    print(f'{len(s.tokens)} tokens')
+    print(f'parse    {parse:8.3f}s')
+    print(f'ladder   {ladder:8.3f}s  ({ladder / parse:.2f}x)')
+    print(f'evaluate {evaluate:8.3f}s')
+    print(f'total    {parse + evaluate:8.3f}s')
+
+    deep = Scanner('(' * 10000 + '1' + ')' * 10000 + ';')
+    deep.scan()
+    for name, parser in (('parse', Parser), ('ladder', LadderParser)):
+        try:
+            elapsed = timed(lambda: parser(deep.tokens).parse(), 1)
+            print(f'{name:8} {elapsed:8.3f}s  depth 10000')
+        except RecursionError:
+            print(f'{name:8} RecursionError at depth 10000')
+
+
+if __name__ == '__main__':
+    main()
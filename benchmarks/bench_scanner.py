@@ -0,0 +1,28 @@
+import sys
+import time
+
+from app.scanner import Scanner
+from app.regexscanner import RegexScanner
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_scanner [base_statements]
+# tokenizing time should double with the input size, on the handwritten
+# loop and on the regex backend
+
+
+def main() -> None:
+    base = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f'{"scanner":<13} {"bytes":>10} {"tokens":>9} {"seconds":>8} {"us/KB":>7}')
+    for factor in (1, 2, 4, 8):
+        source = statements(base * factor)
+        for scanner in (Scanner, RegexScanner):
+            start = time.perf_counter()
+            s = scanner(source)
+            s.scan()
+            elapsed = time.perf_counter() - start
+            print(f'{scanner.__name__:<13} {len(source):>10} {len(s.tokens):>9} {elapsed:>8.3f} '
+                  f'{elapsed * 1e6 / (len(source) / 1024):>7.1f}')
+
+
+if __name__ == '__main__':
+    main()
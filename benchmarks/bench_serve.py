@@ -0,0 +1,68 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import statements
+
+# usage: python -m benchmarks.bench_serve [requests] [connections] [statements]
+# load test: starts "serve" on a temporary socket and sends requests run
+# requests from concurrent connections, each waiting for its answer before
+# sending the next, then reports latency percentiles and throughput
+
+
+async def client(path: str, sources: list[str], latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_unix_connection(path)
+    for source in sources:
+        start = time.perf_counter()
+        writer.write(json.dumps({'command': 'run', 'source': source}).encode() + b'\n')
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if response['code'] != 0:
+            raise RuntimeError(response['stderr'])
+    writer.close()
+
+
+async def load(path: str, n: int, connections: int, size: int) -> list[float]:
+    sources = [statements(size, i) for i in range(n)]
+    latencies: list[float] = []
+    await asyncio.gather(*(client(path, sources[i::connections], latencies)
+                           for i in range(connections)))
+    return latencies
+
+
+def percentile(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'lox.sock')
+        server = subprocess.Popen([sys.executable, '-m', 'app.main', 'serve', path])
+        try:
+            while not os.path.exists(path):
+                time.sleep(0.05)
+            asyncio.run(load(path, connections, connections, size))  # warm the workers
+            start = time.perf_counter()
+            latencies = sorted(asyncio.run(load(path, n, connections, size)))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.wait()
+    print(f'{n} requests of {size} statements over {connections} connections, '
+          f'{os.cpu_count()} CPUs')
+    print(f'p50 {percentile(latencies, 0.5) * 1000:8.2f}ms')
+    print(f'p99 {percentile(latencies, 0.99) * 1000:8.2f}ms')
+    print(f'max {latencies[-1] * 1000:8.2f}ms')
+    print(f'{n / elapsed:8.1f} requests/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import random
+
+# seeded generators of synthetic Lox sources used by the benchmarks
+
+
+def statements(n: int, seed: int = 0) -> str:
+    # a mix of declarations, assignments, prints, strings and comments
+    rnd = random.Random(seed)
+    lines: list[str] = []
+    for i in range(n):
+        kind = rnd.randrange(5)
+        if kind == 0:
+            lines.append(f'var v{i} = {rnd.randint(0, 999)}.{rnd.randint(0, 99)};')
+        elif kind == 1:
+            lines.append(f'print (1 + 2) * ({rnd.randint(0, 99)} - 3) >= 4;')
+        elif kind == 2:
+            lines.append(f'var s{i} = "some string literal {i}" + "tail";')
+        elif kind == 3:
+            lines.append(f'// comment number {i} with some words')
+        else:
+            lines.append('print !true == !!false != nil;')
+    return '\n'.join(lines) + '\n'
+
+
+def arithmetic(n: int, width: int = 12, seed: int = 0) -> str:
+    # n statements of wide arithmetic expressions over literals and variables
+    rnd = random.Random(seed)
+    lines: list[str] = ['var a = 1.5;', 'var b = 2;']
+    for i in range(n):
+        terms = [rnd.choice(('a', 'b', str(rnd.randint(1, 99))))
+                 for _ in range(width)]
+        expr = terms[0]
+        for term in terms[1:]:
+            op = rnd.choice('+-*')
+            expr = f'({expr} {op} {term})' if op == '*' else f'{expr} {op} {term}'
+        if i % 8 == 0:
+            lines.append(f'print {expr} > -a;')
+        else:
+            lines.append(f'a = {expr} / 1000;')
+    return '\n'.join(lines) + '\n'
+
+
+def nested(n: int, depth: int = 24, seed: int = 0) -> str:
+    # n print statements of random expression trees nested depth levels deep
+    rnd = random.Random(seed)
+
+    def expr(level: int) -> str:
+        if level == 0:
+            return rnd.choice(('1', '2.5', 'a', '(3)'))
+        kind = rnd.randrange(4)
+        if kind == 0:
+            return f'({expr(level - 1)})'
+        if kind == 1:
+            return f'-{expr(level - 1)}'
+        op = rnd.choice(('+', '-', '*', '/'))
+        return f'{expr(level - 1)} {op} {rnd.choice(("4", "a", "0.5"))}'
+
+    lines = ['var a = 7;']
+    for _ in range(n):
+        lines.append(f'print {expr(depth)} != nil;')
+    return '\n'.join(lines) + '\n'
+
+
+def deep(n: int, depth: int = 200, seed: int = 0) -> str:
+    # n statements nested depth levels deep, parenthesized or as a unary chain
+    rnd = random.Random(seed)
+    lines: list[str] = []
+    for _ in range(n):
+        value = rnd.randint(1, 99)
+        if rnd.randrange(2):
+            lines.append('print ' + '(' * depth + f'{value} + 1' + ')' * depth + ';')
+        else:
+            lines.append('print ' + '-' * depth + f'{value};')
+    return '\n'.join(lines) + '\n'
+
+
+def chains(n: int, width: int = 200, seed: int = 0) -> str:
+    # n statements of one flat chain of width operands at mixed precedences
+    rnd = random.Random(seed)
+    lines: list[str] = ['var a = 3;']
+    for _ in range(n):
+        terms = [rnd.choice(('a', str(rnd.randint(1, 9)))) for _ in range(width)]
+        expr = terms[0]
+        for term in terms[1:]:
+            expr += f' {rnd.choice("+-*")} {term}'
+        lines.append(f'a = ({expr}) / 1000;')
+    return '\n'.join(lines) + '\n'
+
+
+def declarations(n: int, seed: int = 0) -> str:
+    # n var declarations, each reading one or two of the ones before it
+    rnd = random.Random(seed)
+    lines: list[str] = ['var v0 = 1;']
+    for i in range(1, n):
+        if rnd.randrange(3) == 0:
+            lines.append(f'var v{i};')
+        else:
+            lines.append(f'var v{i} = v{rnd.randrange(i)} != nil;')
+    return '\n'.join(lines) + '\n'
+
+
+def concatenation(n: int, reset: int = 1024, seed: int = 0) -> str:
+    # strings built up by + in a few accumulators, each reset every reset lines
+    rnd = random.Random(seed)
+    lines: list[str] = ['var s0 = "";', 'var s1 = "";', 'var s2 = "";']
+    for i in range(n):
+        if i % reset == reset - 1:
+            lines.append(f's{i // reset % 3} = "";')
+        else:
+            target = f's{rnd.randrange(3)}'
+            words = ' + '.join(f'"w{rnd.randint(0, 999)}"' for _ in range(rnd.randint(1, 4)))
+            lines.append(f'{target} = {target} + {words};')
+    return '\n'.join(lines) + '\n'
+
+
+def prints(n: int, seed: int = 0) -> str:
+    # n print statements of short literals and variables
+    rnd = random.Random(seed)
+    lines: list[str] = ['var x = 42;', 'var y = "why";']
+    for _ in range(n):
+        value = rnd.choice(('x', 'y', 'nil', 'true', '"text"', str(rnd.randint(0, 9999))))
+        lines.append(f'print {value};')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,187 @@
+import json
+import os
+import platform
+import statistics
+import sys
+from typing import Any, Callable
+
+from app.main import parse_args
+from app.scanner import Scanner
+from app.RDParser import Parser
+from app.evaluator import Evaluator
+from app.interpreter import Interpreter
+from app.resolver import Resolver
+from app.output import Output
+from app.env import UNDEFINED
+from app.AST import *
+from benchmarks import generators
+from benchmarks.timing import timed
+
+# usage: python -m benchmarks.suite [--scale=F] [--repeat=N] [--only=a,b]
+#                                   [--baseline=file] [--threshold=F]
+#                                   [--floor=S] [--save]
+# times the Scanner, Parser, Evaluator and Interpreter stages separately on
+# each generated workload, the median of repeat rounds, and compares every
+# time with the stored baseline: a stage more than threshold (default 0.25,
+# 25%) and more than floor seconds (default 0.002) slower fails the run with
+# exit code 1. the floor keeps the jitter of stages taking a few milliseconds
+# from failing it. --save writes the times as the new baseline.
+#
+# the baseline also stores the time of a fixed pure python loop, timed in
+# every round with the stages; times are scaled by how much faster or slower
+# that loop runs now, so a machine busier than when the baseline was saved,
+# or another machine, still compares roughly. save one per machine to be exact
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_FLOOR = 0.002
+DEFAULT_REPEAT = 9
+
+# name: generator of the workload at scale 1, every one seeded
+WORKLOADS: dict[str, Callable[[float], str]] = {
+    'tokens': lambda scale: generators.statements(int(20000 * scale)),
+    'deep': lambda scale: generators.deep(int(100 * scale)),
+    'chains': lambda scale: generators.chains(int(100 * scale)),
+    'declarations': lambda scale: generators.declarations(int(20000 * scale)),
+    'concatenation': lambda scale: generators.concatenation(int(10000 * scale)),
+    'prints': lambda scale: generators.prints(int(20000 * scale)),
+}
+STAGES = ('scan', 'parse', 'evaluate', 'interpret')
+
+
+def calibration_loop() -> None:
+    total = 0
+    for i in range(1000000):
+        total += i % 7
+
+
+def scan(source: str) -> list:
+    s = Scanner(source)
+    s.scan()
+    return s.tokens
+
+
+def evaluate(stmts: list[Stmt]) -> Callable[[], None]:
+    # only the expressions and the stores of declarations, over statements
+    # resolved beforehand into an env that starts empty on every run
+    evaluator = Evaluator()
+    resolver = Resolver(evaluator.env)
+    for stmt in stmts:
+        resolver.resolve(stmt)
+    env = evaluator.env
+    size = len(env.values)
+
+    def run() -> None:
+        env.values = [UNDEFINED] * size
+        values = env.values
+        for stmt in stmts:
+            value = evaluator.evaluate(stmt.expr) if stmt.expr else None
+            if isinstance(stmt, Decl):
+                values[stmt.slot] = value
+    return run
+
+
+def interpret(stmts: list[Stmt]) -> Callable[[], None]:
+    # the whole run: resolving, evaluating and printing into a discarded stream
+    def run() -> None:
+        with open(os.devnull, 'w') as stream:
+            Interpreter(stmts, out=Output(stream)).interpret()
+    return run
+
+
+def stages(workload: str, scale: float) -> dict[str, Callable[[], object]]:
+    source = WORKLOADS[workload](scale)
+    tokens = scan(source)
+    stmts = Parser(tokens).parse()
+    return {
+        'scan': lambda: scan(source),
+        'parse': lambda: Parser(tokens).parse(),
+        'evaluate': evaluate(stmts),
+        'interpret': interpret(stmts),
+    }
+
+
+def measure(workloads: list[str], scale: float,
+            repeat: int) -> tuple[dict[str, dict[str, float]], float]:
+    # the median of repeat rounds, each timing the calibration loop and every
+    # stage of every workload once, so a stretch of time the machine is busy
+    # is spread over all of them rather than slowing down the few stages that
+    # happened to run in it
+    jobs = {workload: stages(workload, scale) for workload in workloads}
+    times: dict[str, dict[str, list[float]]] = {
+        workload: {stage: [] for stage in STAGES} for workload in workloads}
+    calibration: list[float] = []
+    for _ in range(repeat):
+        calibration.append(timed(calibration_loop, 1))
+        for workload, fns in jobs.items():
+            for stage, fn in fns.items():
+                times[workload][stage].append(timed(fn, 1))
+    results = {workload: {stage: statistics.median(runs) for stage, runs in stages.items()}
+               for workload, stages in times.items()}
+    return results, statistics.median(calibration)
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, Any],
+            calibration: float, threshold: float, floor: float) -> list[str]:
+    # the stages slower than their baseline by more than threshold and floor,
+    # a workload or stage missing from the baseline has nothing to regress from
+    speed = calibration / baseline['calibration']
+    regressions: list[str] = []
+    for workload, stages in results.items():
+        for stage, seconds in stages.items():
+            before = baseline['results'].get(workload, {}).get(stage)
+            if not before:
+                continue
+            expected = before * speed
+            if seconds > expected * (1 + threshold) and seconds - expected > floor:
+                regressions.append(f'{workload}/{stage}')
+    return regressions
+
+
+def main() -> None:
+    _, options = parse_args(sys.argv[1:])
+    scale = float(options.get('scale') or 1)
+    repeat = int(options.get('repeat') or DEFAULT_REPEAT)
+    path = options.get('baseline') or DEFAULT_BASELINE
+    threshold = float(options.get('threshold') or DEFAULT_THRESHOLD)
+    floor = float(options.get('floor') or DEFAULT_FLOOR)
+    workloads = options['only'].split(',') if options.get('only') else list(WORKLOADS)
+
+    baseline: dict[str, Any] | None = None
+    if os.path.exists(path) and 'save' not in options:
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline['scale'] != scale:
+            print(f'baseline {path} is at scale {baseline["scale"]}, not {scale}', file=sys.stderr)
+            exit(2)
+
+    results, calibration = measure(workloads, scale, repeat)
+
+    speed = calibration / baseline['calibration'] if baseline else 1.0
+    print(f'{"workload":<14} {"stage":<10} {"seconds":>9} {"baseline":>9} {"change":>8}')
+    for workload in workloads:
+        for stage, seconds in results[workload].items():
+            before = baseline['results'].get(workload, {}).get(stage) if baseline else None
+            if before:
+                expected = before * speed
+                print(f'{workload:<14} {stage:<10} {seconds:9.4f} {expected:9.4f} '
+                      f'{seconds / expected - 1:+8.1%}')
+            else:
+                print(f'{workload:<14} {stage:<10} {seconds:9.4f} {"-":>9} {"-":>8}')
+
+    if 'save' in options:
+        with open(path, 'w') as f:
+            json.dump({'python': platform.python_version(), 'scale': scale, 'repeat': repeat,
+                       'calibration': calibration, 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f'saved baseline to {path}')
+    elif baseline:
+        regressions = compare(results, baseline, calibration, threshold, floor)
+        if regressions:
+            print(f'regressed by more than {threshold:.0%}: {", ".join(regressions)}',
+                  file=sys.stderr)
+            exit(1)
+
+
+if __name__ == '__main__':
+    main()
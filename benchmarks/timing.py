@@ -0,0 +1,23 @@
+import contextlib
+import gc
+import io
+import time
+from typing import Callable
+
+
+def timed(fn: Callable[[], object], repeat: int = 5) -> float:
+    # the best of repeat runs of fn with what it prints discarded. the
+    # collector is left off while timing so a pass it happens to start does
+    # not land in one run's time
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best